@@ -0,0 +1,32 @@
+"""add_meetings_host_created_index
+
+Revision ID: 3c1d9e2b7a41
+Revises: ff6a797400b6
+Create Date: 2026-10-17 10:12:04.118530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d9e2b7a41'
+down_revision: Union[str, Sequence[str], None] = 'ff6a797400b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    indexes = [i['name'] for i in insp.get_indexes('meetings')]
+    if 'ix_meetings_host_id_created_at' not in indexes:
+        op.create_index('ix_meetings_host_id_created_at', 'meetings', ['host_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meetings_host_id_created_at', table_name='meetings')
@@ -0,0 +1,36 @@
+"""add_meeting_id_sequence
+
+Revision ID: 8b52f0c4d7e3
+Revises: 3c1d9e2b7a41
+Create Date: 2026-10-17 11:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b52f0c4d7e3'
+down_revision: Union[str, Sequence[str], None] = '3c1d9e2b7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if 'meeting_id_sequence' not in insp.get_table_names():
+        op.create_table(
+            'meeting_id_sequence',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('next_value', sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('meeting_id_sequence')
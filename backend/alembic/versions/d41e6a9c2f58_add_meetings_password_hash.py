@@ -0,0 +1,32 @@
+"""add_meetings_password_hash
+
+Revision ID: d41e6a9c2f58
+Revises: 8b52f0c4d7e3
+Create Date: 2026-10-17 12:20:13.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e6a9c2f58'
+down_revision: Union[str, Sequence[str], None] = '8b52f0c4d7e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    columns = [c['name'] for c in insp.get_columns('meetings')]
+    if 'password_hash' not in columns:
+        op.add_column('meetings', sa.Column('password_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('meetings', 'password_hash')
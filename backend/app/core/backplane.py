@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Called with every envelope published by *another* node
+EnvelopeHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class Backplane:
+    """
+    Pub/sub transport that carries signaling frames between workers.
+
+    Each ConnectionManager delivers to its own sockets directly and publishes
+    an envelope for everybody else:
+
+        {"origin": <node id>, "room": <room id>, "target": <peer id or None>,
+         "kind": <message type>, "data": <serialized frame>}
+
+    The sender is always local to the origin node, so receiving nodes relay to
+    all of their peers in the room (or only to `target`).
+
+    Presence is shared the same way: each node publishes its own count and
+    roster per room, and reads those of the other live nodes.
+    """
+
+    def __init__(self):
+        self.node_id = uuid.uuid4().hex
+        self._handler: Optional[EnvelopeHandler] = None
+
+    async def start(self, handler: EnvelopeHandler):
+        self._handler = handler
+
+    async def close(self):
+        self._handler = None
+
+    async def subscribe(self, room_id: str):
+        pass
+
+    async def unsubscribe(self, room_id: str):
+        pass
+
+    async def publish(self, envelope: Dict[str, Any]):
+        raise NotImplementedError
+
+    def envelope(self, room_id: str, data: str, kind: Optional[str], target: Optional[str] = None) -> Dict[str, Any]:
+        return {"origin": self.node_id, "room": room_id, "target": target, "kind": kind, "data": data}
+
+    async def publish_presence(self, room_id: str, count: int, roster: List[Dict[str, Any]]):
+        """Replace this node's connection count and roster for `room_id`; count 0 clears it."""
+
+    async def remote_presence(self, room_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """{room_id: [{"count": n, "peers": [...]}, one per other live node]}"""
+        return {}
+
+
+class InMemoryBackplane(Backplane):
+    """
+    Process-local backplane. With a single manager it is a no-op; several
+    managers attached to the same hub behave like separate workers.
+    """
+
+    def __init__(self, hub: Optional[List["InMemoryBackplane"]] = None):
+        super().__init__()
+        self.hub = hub if hub is not None else []
+        self.rooms: Set[str] = set()
+        self.presence: Dict[str, Dict[str, Any]] = {}
+
+    async def start(self, handler: EnvelopeHandler):
+        await super().start(handler)
+        if self not in self.hub:
+            self.hub.append(self)
+
+    async def close(self):
+        if self in self.hub:
+            self.hub.remove(self)
+        await super().close()
+
+    async def subscribe(self, room_id: str):
+        self.rooms.add(room_id)
+
+    async def unsubscribe(self, room_id: str):
+        self.rooms.discard(room_id)
+
+    async def publish(self, envelope: Dict[str, Any]):
+        for node in list(self.hub):
+            if node is not self and node._handler and envelope["room"] in node.rooms:
+                await node._handler(envelope)
+
+    async def publish_presence(self, room_id: str, count: int, roster: List[Dict[str, Any]]):
+        if count:
+            self.presence[room_id] = {"count": count, "peers": roster}
+        else:
+            self.presence.pop(room_id, None)
+
+    async def remote_presence(self, room_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        others = [node for node in self.hub if node is not self]
+        return {
+            room_id: [node.presence[room_id] for node in others if room_id in node.presence]
+            for room_id in room_ids
+        }
+
+
+class RedisBackplane(Backplane):
+    """
+    Redis pub/sub backplane: one channel per room, subscribed while the room
+    has at least one local connection. Requires the `redis` package.
+
+    Presence lives in one hash per room, {prefix}:presence:{room}, with a
+    field per node holding that node's count and roster. Each node also
+    keeps {prefix}:node:{id} alive with a short TTL, so the entries of a
+    worker that died without cleaning up stop counting once it expires.
+    """
+
+    NODE_TTL = 30  # seconds; refreshed every NODE_TTL / 3
+    PRESENCE_TTL = 86400  # idle room hashes are dropped eventually
+
+    def __init__(self, url: str, channel_prefix: str = "zoom:ws"):
+        super().__init__()
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("WS_BACKPLANE=redis requires the 'redis' package") from e
+        self.url = url
+        self.channel_prefix = channel_prefix
+        self._redis = aioredis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._listener: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        # Rooms this node has a presence field in
+        self._presence_rooms: Set[str] = set()
+
+    def _channel(self, room_id: str) -> str:
+        return f"{self.channel_prefix}:room:{room_id}"
+
+    def _presence_key(self, room_id: str) -> str:
+        return f"{self.channel_prefix}:presence:{room_id}"
+
+    def _node_key(self, node_id: str) -> str:
+        return f"{self.channel_prefix}:node:{node_id}"
+
+    async def start(self, handler: EnvelopeHandler):
+        await super().start(handler)
+        self._keepalive_task = asyncio.create_task(self._keepalive())
+        logger.info(f"Redis backplane node {self.node_id} connected to {self.url}")
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for room_id in self._presence_rooms:
+                    pipe.hdel(self._presence_key(room_id), self.node_id)
+                pipe.delete(self._node_key(self.node_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis backplane: presence cleanup failed: {e}")
+        self._presence_rooms.clear()
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+        await super().close()
+
+    async def subscribe(self, room_id: str):
+        await self._pubsub.subscribe(self._channel(room_id))
+        # A listener that has stopped reading may not have cleared itself yet
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, room_id: str):
+        await self._pubsub.unsubscribe(self._channel(room_id))
+
+    async def publish(self, envelope: Dict[str, Any]):
+        await self._redis.publish(self._channel(envelope["room"]), json.dumps(envelope))
+
+    async def publish_presence(self, room_id: str, count: int, roster: List[Dict[str, Any]]):
+        key = self._presence_key(room_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if count:
+                pipe.hset(key, self.node_id, json.dumps({"count": count, "peers": roster}))
+                pipe.expire(key, self.PRESENCE_TTL)
+                self._presence_rooms.add(room_id)
+            else:
+                pipe.hdel(key, self.node_id)
+                self._presence_rooms.discard(room_id)
+            await pipe.execute()
+
+    async def remote_presence(self, room_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for room_id in room_ids:
+                    pipe.hgetall(self._presence_key(room_id))
+                hashes = await pipe.execute()
+            nodes = {node for fields in hashes for node in fields} - {self.node_id.encode()}
+            if not nodes:
+                return {}
+            nodes = list(nodes)
+            alive = await self._redis.mget([self._node_key(node.decode()) for node in nodes])
+            live = {node for node, flag in zip(nodes, alive) if flag is not None}
+        except Exception as e:
+            logger.warning(f"Redis backplane: presence read failed, using local state only: {e}")
+            return {}
+        return {
+            room_id: [json.loads(value) for node, value in fields.items() if node in live]
+            for room_id, fields in zip(room_ids, hashes)
+        }
+
+    async def _keepalive(self):
+        while True:
+            try:
+                await self._redis.set(self._node_key(self.node_id), 1, ex=self.NODE_TTL)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis backplane: node keepalive failed: {e}")
+            await asyncio.sleep(self.NODE_TTL / 3)
+
+    async def _listen(self):
+        try:
+            while self._pubsub.subscribed:
+                try:
+                    async for message in self._pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        envelope = json.loads(message["data"])
+                        if envelope.get("origin") == self.node_id or not self._handler:
+                            continue
+                        await self._handler(envelope)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Redis backplane listener error: {e}")
+                    await asyncio.sleep(1.0)
+        finally:
+            if self._listener is asyncio.current_task():
+                self._listener = None
+
+
+def create_backplane(kind: str, redis_url: str = "") -> Backplane:
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("WS_BACKPLANE=redis requires REDIS_URL to be set")
+        return RedisBackplane(redis_url)
+    if kind == "memory":
+        return InMemoryBackplane()
+    raise ValueError(f"Unknown WS_BACKPLANE {kind!r}, expected 'memory' or 'redis'")
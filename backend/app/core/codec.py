@@ -0,0 +1,29 @@
+"""
+JSON codec for the signaling relay. Uses orjson when it is installed and
+falls back to the standard library otherwise.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(text: str) -> Any:
+        return orjson.loads(text)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    BACKEND = "json"
+
+    def loads(text: str) -> Any:
+        return json.loads(text)
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
@@ -16,10 +16,67 @@ env_file = os.path.join(project_root, ".env")
 
 class Settings(BaseSettings):
     DATABASE_URL: str = ""
+    DB_ASYNC: bool = False  # serve routes from an asyncpg/aiosqlite engine instead of the threadpool
+    DB_POOL_SIZE: int = 5  # persistent connections per engine (per worker)
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed during bursts
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 disables
+    DB_SCHEMA_CHECK: str = "warn"  # startup revision check: off | warn | strict (refuse to start)
+    DB_POOL_PRE_PING: bool = True  # ping on every checkout; turn off to rely on DB_POOL_RECYCLE alone
+
+    # Keys meeting IDs (and signed tokens); must stay fixed once meetings exist
+    SECRET_KEY: str = ""
+    MEETING_ID_BLOCK_SIZE: int = 256  # meeting IDs each worker reserves per DB round trip
+
+    # /meetings/join attempt limiter, per (meeting, user)
+    JOIN_RATE_CAPACITY: float = 10  # attempts allowed in a burst
+    JOIN_RATE_PER_SEC: float = 0.2  # refill rate (one attempt every 5 seconds)
+    JOIN_RATE_STORAGE: str = "memory"  # memory | redis (shared by all workers via REDIS_URL)
+
+    # Internal endpoints (/internal/*); disabled (403) unless set, then sent as X-Internal-Token
+    INTERNAL_API_TOKEN: str = ""
     CLERK_PUBLISHABLE_KEY: str = ""
     CLERK_SECRET_KEY: str = ""
     CLERK_FRONTEND_API: str = ""
 
+    # Shared outbound HTTP client (Clerk JWKS + Users API)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection stays in the pool
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP2: bool = True  # used only when the `h2` package is installed
+
+    # Auth caches
+    AUTH_TOKEN_CACHE_SIZE: int = 4096  # verified tokens kept; 0 disables
+    AUTH_TOKEN_CACHE_TTL: float = 300.0  # seconds, capped by the token's exp
+    CLERK_PROFILE_CACHE_SIZE: int = 4096
+    CLERK_PROFILE_CACHE_TTL: float = 900.0  # seconds a Users API profile is reused
+    CLERK_PROFILE_NEGATIVE_TTL: float = 60.0  # seconds a failed lookup is remembered
+    IDENTITY_CACHE_SIZE: int = 4096
+    IDENTITY_CACHE_TTL: float = 300.0  # seconds a clerk_id → user snapshot is trusted
+
+    # Meeting lookup cache (meeting_id / invitation_token)
+    MEETING_CACHE_SIZE: int = 10000
+    MEETING_CACHE_TTL: float = 300.0  # seconds; entries are also dropped when a meeting is updated
+    MEETING_CACHE_REDIS: bool = False  # share entries between workers through REDIS_URL
+
+    # WebSocket signaling
+    WS_RELAY_MODE: str = "raw"  # raw: forward frames as received | json: parse and re-serialize
+    WS_SEND_TIMEOUT: float = 5.0  # seconds before a stalled peer is evicted
+    WS_OUTBOUND_QUEUE_SIZE: int = 256  # frames buffered per connection
+    WS_OUTBOUND_MAX_LAG: float = 1.0  # seconds a full queue's oldest frame may wait before the backpressure policy applies
+    WS_BACKPRESSURE_POLICY: str = "drop_oldest_ice"  # drop_oldest_ice | coalesce | disconnect
+    WS_ICE_BATCH_WINDOW_MS: int = 20  # 0 disables; only peers advertising "ice-batch" get batches
+    WS_BACKPLANE: str = "memory"  # memory | redis (needed for multiple workers)
+    REDIS_URL: str = ""
+    WS_PING_INTERVAL: float = 20.0  # seconds between server pings; 0 disables heartbeats
+    WS_PING_TIMEOUT: float = 60.0  # peers silent this long (no frames or pongs) are reaped
+    WS_DRAIN_TIMEOUT: float = 25.0  # seconds to wait for peers to move on shutdown; keep below the platform's kill grace
+    WS_RECONNECT_JITTER_MS: int = 15000  # reconnect hints are spread over [0, this] ms
+    WS_TICKET_TTL: float = 300.0  # seconds a join ticket from /meetings/join stays valid
+    WS_TICKET_RENEW_WINDOW: float = 43200.0  # seconds after expiry a ticket can still be swapped at /meetings/ticket
+
     model_config = ConfigDict(env_file=env_file, extra="allow")
 
 
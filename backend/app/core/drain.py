@@ -0,0 +1,51 @@
+"""
+Drain live WebSocket rooms before the server shuts down.
+
+uvicorn closes every socket with 1012 as soon as it starts shutting down,
+before the lifespan shutdown runs, so draining has to begin when SIGTERM
+arrives. `install_sigterm_drain` puts a handler in front of the server's:
+on SIGTERM the manager starts draining, and the server's own handler runs
+once the drain finishes or its deadline passes. A second SIGTERM skips the
+wait. Deploy hooks can also start a drain explicitly via POST /internal/drain.
+"""
+import asyncio
+import logging
+import signal
+import threading
+from typing import Callable
+
+from .config import settings
+from .websocket_manager import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+def install_sigterm_drain(manager: ConnectionManager) -> Callable[[], None]:
+    """Wrap the current SIGTERM handler; returns a function that restores it."""
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def forward(sig, frame):
+        if callable(previous):
+            previous(sig, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    def handle_sigterm(sig, frame):
+        if manager.draining:
+            forward(sig, frame)
+            return
+        logger.info("SIGTERM received; draining WebSocket rooms before shutdown")
+
+        def start():
+            task = manager.drain(settings.WS_DRAIN_TIMEOUT, settings.WS_RECONNECT_JITTER_MS)
+            task.add_done_callback(lambda _: forward(sig, frame))
+
+        loop.call_soon_threadsafe(start)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    return lambda: signal.signal(signal.SIGTERM, previous)
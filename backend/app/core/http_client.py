@@ -0,0 +1,66 @@
+"""
+Application-scoped httpx client shared by every outbound call to Clerk.
+
+Created in the FastAPI lifespan and closed on shutdown so connections are
+pooled and kept alive across requests. Tests can install a client with a
+mock transport via `init_http_client(transport=...)`.
+"""
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(transport: Optional["httpx.AsyncBaseTransport"] = None) -> "httpx.AsyncClient":
+    # Imported here rather than at module level: httpx (and certifi/ssl) is
+    # only needed once the app starts, not when it is imported
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    http2 = settings.HTTP2 and transport is None and _http2_available()
+    logger.info(f"Creating shared HTTP client (http2={http2}, max_connections={settings.HTTP_MAX_CONNECTIONS})")
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2, transport=transport)
+
+
+async def init_http_client(transport: Optional["httpx.AsyncBaseTransport"] = None) -> "httpx.AsyncClient":
+    """Create (or replace) the shared client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = create_http_client(transport)
+    return _client
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared client, creating it lazily outside the app lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Capability a client advertises in its "join" message to receive batches
+ICE_BATCH_CAPABILITY = "ice-batch"
+
+
+class IceCandidateBatcher:
+    """
+    Coalesces trickled ICE candidates per (target, sender) pair.
+
+    The first candidate for a pair opens a short window; everything that
+    arrives before it closes is delivered as a single "ice-candidates" frame.
+    `deliver(target, sender_id, candidates)` is called from the event loop.
+    """
+
+    def __init__(self, window: float, deliver: Callable[[Any, str, List[Any]], None]):
+        self.window = window
+        self.deliver = deliver
+        self._pending: Dict[Tuple[Any, str], List[Any]] = {}
+        self._timers: Dict[Tuple[Any, str], asyncio.TimerHandle] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def add(self, target: Any, sender_id: str, candidate: Any):
+        key = (target, sender_id)
+        buffered = self._pending.get(key)
+        if buffered is None:
+            self._pending[key] = [candidate]
+            self._timers[key] = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        else:
+            buffered.append(candidate)
+
+    def flush(self, target: Any, sender_id: Optional[str]):
+        """Deliver anything buffered for the pair now, e.g. ahead of a new offer."""
+        key = (target, sender_id)
+        timer = self._timers.get(key)
+        if timer is not None:
+            timer.cancel()
+            self._flush(key)
+
+    def discard(self, target: Any):
+        """Drop buffers addressed to a peer that has gone away."""
+        for key in [k for k in self._pending if k[0] is target]:
+            self._timers.pop(key).cancel()
+            del self._pending[key]
+
+    def _flush(self, key: Tuple[Any, str]):
+        self._timers.pop(key, None)
+        candidates = self._pending.pop(key, None)
+        if candidates:
+            self.deliver(key[0], key[1], candidates)
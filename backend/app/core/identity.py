@@ -0,0 +1,58 @@
+"""
+In-process identity cache: clerk_id → snapshot of the matching users row.
+
+Lets authenticated requests resolve the current user without touching the
+database once the user has been seen. Entries are replaced whenever the row
+is written and can be dropped explicitly with `invalidate_identity`.
+Like TTLCache, only call these from the event loop, never from the threadpool.
+"""
+from typing import Any, Dict, Optional
+
+from .cache import MISSING, TTLCache
+from .config import settings
+
+
+class CurrentUser:
+    """Immutable snapshot of a users row; readable like the ORM object."""
+
+    __slots__ = ("id", "clerk_id", "email", "first_name", "last_name")
+
+    def __init__(
+        self,
+        id: int,
+        clerk_id: str,
+        email: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+    ):
+        self.id = id
+        self.clerk_id = clerk_id
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+
+    @classmethod
+    def from_row(cls, user: Any) -> "CurrentUser":
+        return cls(user.id, user.clerk_id, user.email, user.first_name, user.last_name)
+
+
+_identity_cache = TTLCache(settings.IDENTITY_CACHE_SIZE, settings.IDENTITY_CACHE_TTL)
+
+
+def get_cached_identity(clerk_id: str) -> Optional[CurrentUser]:
+    identity = _identity_cache.get(clerk_id)
+    return None if identity is MISSING else identity
+
+
+def remember_identity(user: Any) -> CurrentUser:
+    identity = user if isinstance(user, CurrentUser) else CurrentUser.from_row(user)
+    _identity_cache.set(identity.clerk_id, identity)
+    return identity
+
+
+def invalidate_identity(clerk_id: str):
+    _identity_cache.pop(clerk_id)
+
+
+def identity_cache_stats() -> Dict[str, Any]:
+    return _identity_cache.stats()
@@ -0,0 +1,23 @@
+import hashlib
+import hmac
+import logging
+from functools import lru_cache
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_DEV_SECRET = "zoom-clone-dev-secret"
+
+
+@lru_cache(maxsize=None)
+def derive_key(purpose: str) -> bytes:
+    """
+    Per-purpose subkey of SECRET_KEY, so meeting IDs, password hashes and
+    signed tokens never share key material.
+    """
+    secret = settings.SECRET_KEY
+    if not secret:
+        logger.warning(f"SECRET_KEY is not set; using a development key for {purpose}")
+        secret = _DEV_SECRET
+    return hmac.new(secret.encode(), purpose.encode(), hashlib.sha256).digest()
@@ -0,0 +1,273 @@
+"""
+Cache-aside layer for meeting lookups by meeting_id / invitation_token.
+
+Only the fields that never change after creation are cached, plus
+`is_active`; a committed UPDATE or DELETE of a meeting row drops its entries.
+Concurrent misses for the same key share one database query, so hundreds
+of participants opening the same invitation link produce a single SELECT.
+Optionally backed by Redis so all workers share warm entries.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .cache import MISSING, TTLCache
+from .config import settings
+from ..models.meeting import Meeting
+
+logger = logging.getLogger(__name__)
+
+
+class CachedMeeting:
+    """Read-only snapshot of a meetings row; readable like the ORM object."""
+
+    __slots__ = ("id", "meeting_id", "title", "password", "password_hash", "invitation_token", "host_id", "is_active", "created_at")
+
+    def __init__(self, **fields: Any):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_row(cls, row: Any) -> "CachedMeeting":
+        return cls(**{name: getattr(row, name) for name in cls.__slots__})
+
+    def to_json(self) -> str:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        if data["created_at"] is not None:
+            data["created_at"] = data["created_at"].isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedMeeting":
+        data = json.loads(raw)
+        if data.get("created_at"):
+            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+Loader = Callable[[], Awaitable[Optional[Any]]]
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class MeetingCache:
+    def __init__(self, max_size: int, ttl: float, redis_url: str = "", ended_ttl: float = 0.0):
+        self.ttl = ttl
+        self._by_id = TTLCache(max_size, ttl)
+        # invitation_token -> meeting_id
+        self._token_index = TTLCache(max_size, ttl)
+        self._inflight: Dict[str, "asyncio.Future[Optional[CachedMeeting]]"] = {}
+        # meeting_id -> True for meetings this worker saw being ended
+        self._ended = TTLCache(max_size, ended_ttl)
+        self._redis_url = redis_url
+        self._redis = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Bumped by every invalidation; a load that overlapped one is not cached
+        self._epoch = 0
+        self.loads = 0
+        self.coalesced = 0
+
+    def _redis_client(self):
+        if self._redis is None and self._redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url)
+        return self._redis
+
+    @staticmethod
+    def _redis_key(field: str, value: str) -> str:
+        return f"zoom:meeting:{field}:{value}"
+
+    def _get_local(self, field: str, value: str) -> Optional[CachedMeeting]:
+        meeting_id = value
+        if field == "invitation_token":
+            meeting_id = self._token_index.get(value)
+            if meeting_id is MISSING:
+                return None
+        meeting = self._by_id.get(meeting_id)
+        return None if meeting is MISSING else meeting
+
+    def _put_local(self, meeting: CachedMeeting):
+        self._by_id.set(meeting.meeting_id, meeting)
+        if meeting.invitation_token:
+            self._token_index.set(meeting.invitation_token, meeting.meeting_id)
+
+    async def _get_remote(self, field: str, value: str) -> Optional[CachedMeeting]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self._redis_key(field, value))
+        except Exception as e:
+            logger.warning(f"Meeting cache: Redis read failed, falling back to DB: {e}")
+            return None
+        return CachedMeeting.from_json(raw) if raw else None
+
+    async def _put_remote(self, meeting: CachedMeeting):
+        client = self._redis_client()
+        if client is None:
+            return
+        raw = meeting.to_json()
+        ttl = int(self.ttl)
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(self._redis_key("meeting_id", meeting.meeting_id), raw, ex=ttl)
+                if meeting.invitation_token:
+                    pipe.set(self._redis_key("invitation_token", meeting.invitation_token), raw, ex=ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Meeting cache: Redis write failed: {e}")
+
+    async def get(self, field: str, value: str, loader: Loader) -> Optional[CachedMeeting]:
+        """
+        Look up a meeting by `field` ("meeting_id" or "invitation_token").
+        `loader` queries the database and is awaited at most once per key
+        no matter how many requests miss concurrently.
+        """
+        # The loop invalidations from other threads are handed to
+        self._loop = asyncio.get_running_loop()
+
+        meeting = self._get_local(field, value)
+        if meeting is not None:
+            return meeting
+
+        key = f"{field}:{value}"
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._epoch
+        try:
+            meeting = await self._get_remote(field, value)
+            if meeting is None:
+                self.loads += 1
+                row = await loader()
+                meeting = CachedMeeting.from_row(row) if row is not None else None
+                if meeting is not None and self._epoch == epoch:
+                    await self._put_remote(meeting)
+            if meeting is not None and self._epoch == epoch:
+                self._put_local(meeting)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            # Coalesced waiters see the loader's error, not a cancellation
+            future.set_exception(e)
+            future.exception()  # retrieved here; the leader re-raises it below
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(meeting)
+        return meeting
+
+    def invalidate(self, meeting_id: Optional[str], invitation_token: Optional[str] = None, ended: bool = False):
+        """
+        Drop a meeting's entries. Safe to call from the threadpool: TTLCache
+        is event-loop only, so off-loop calls are handed to the loop.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running() and not _on_loop(loop):
+            loop.call_soon_threadsafe(self._invalidate, meeting_id, invitation_token, ended)
+            return
+        self._invalidate(meeting_id, invitation_token, ended)
+
+    def _invalidate(self, meeting_id: Optional[str], invitation_token: Optional[str], ended: bool):
+        self._epoch += 1
+        if meeting_id:
+            self._by_id.pop(meeting_id)
+            if ended:
+                self._ended.set(meeting_id, True)
+            else:
+                self._ended.pop(meeting_id)
+        if invitation_token:
+            self._token_index.pop(invitation_token)
+        if self._redis_url and self._loop is not None and _on_loop(self._loop):
+            keys = [self._redis_key("meeting_id", meeting_id)] if meeting_id else []
+            if invitation_token:
+                keys.append(self._redis_key("invitation_token", invitation_token))
+            self._schedule_remote_delete(keys)
+
+    def is_ended(self, meeting_id: str) -> bool:
+        """Known to have ended, from memory only; never queries the database."""
+        if self._ended.get(meeting_id) is not MISSING:
+            return True
+        meeting = self._by_id.get(meeting_id)
+        return meeting is not MISSING and not meeting.is_active
+
+    def _schedule_remote_delete(self, keys):
+        async def delete():
+            try:
+                await self._redis_client().delete(*keys)
+            except Exception as e:
+                logger.warning(f"Meeting cache: Redis invalidation failed: {e}")
+
+        if keys:
+            asyncio.ensure_future(delete())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._by_id.stats(),
+            "db_loads": self.loads,
+            "coalesced": self.coalesced,
+            "redis": bool(self._redis_url),
+        }
+
+
+meeting_cache = MeetingCache(
+    settings.MEETING_CACHE_SIZE,
+    settings.MEETING_CACHE_TTL,
+    redis_url=settings.REDIS_URL if settings.MEETING_CACHE_REDIS else "",
+    # Long enough to outlive any join ticket issued before the meeting ended
+    ended_ttl=settings.MEETING_CACHE_TTL + settings.WS_TICKET_TTL,
+)
+
+
+# Invalidation waits for the commit: dropping entries at flush time would let
+# a concurrent miss reload the still-committed old row and cache it again.
+_PENDING_KEY = "meeting_cache_invalidations"
+
+
+def _queue_invalidation(target: Meeting, ended: bool):
+    session = object_session(target)
+    entry = (target.meeting_id, target.invitation_token, ended)
+    if session is None:
+        meeting_cache.invalidate(*entry)
+        return
+    session.info.setdefault(_PENDING_KEY, []).append(entry)
+
+
+@event.listens_for(Meeting, "after_update")
+def _on_meeting_update(mapper, connection, target):
+    # Cached fields are immutable apart from is_active, so any UPDATE means
+    # the meeting was ended/reopened and every cached copy must go
+    _queue_invalidation(target, ended=not target.is_active)
+
+
+@event.listens_for(Meeting, "after_delete")
+def _on_meeting_delete(mapper, connection, target):
+    _queue_invalidation(target, ended=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for entry in session.info.pop(_PENDING_KEY, ()):
+        meeting_cache.invalidate(*entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,117 @@
+"""
+Meeting ID allocation.
+
+IDs are a keyed Feistel permutation of a 36-bit counter, printed as nine
+hex digits (xxx-xxx-xxx). Distinct counter values always map to distinct
+IDs, so creation never retries on collisions, yet consecutive meetings get
+unrelated-looking IDs. Each worker reserves a block of counter values from
+the meeting_id_sequence row with a single UPDATE and hands them out from
+memory, so most creations cost no extra round trip.
+
+The permutation key is derived from SECRET_KEY and must not change once
+meetings exist: IDs produced under two different keys can collide.
+"""
+import asyncio
+import hashlib
+import logging
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .keys import derive_key
+from ..database.session import run_db
+from ..models.meeting_id_sequence import MeetingIdSequence
+
+logger = logging.getLogger(__name__)
+
+ID_BITS = 36  # nine hex digits
+
+
+class FeistelPermutation:
+    """Keyed bijection on [0, 2**bits) built from a balanced Feistel network."""
+
+    def __init__(self, key: bytes, bits: int = ID_BITS, rounds: int = 4):
+        if bits % 2:
+            raise ValueError("FeistelPermutation needs an even number of bits")
+        self.bits = bits
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        self.rounds = rounds
+        self.key = key
+
+    def _round(self, i: int, value: int) -> int:
+        digest = hashlib.blake2b(bytes((i,)) + value.to_bytes(4, "big"), digest_size=8, key=self.key).digest()
+        return int.from_bytes(digest, "big") & self.mask
+
+    def permute(self, n: int) -> int:
+        left, right = n >> self.half, n & self.mask
+        for i in range(self.rounds):
+            left, right = right, left ^ self._round(i, right)
+        return (left << self.half) | right
+
+    def invert(self, n: int) -> int:
+        left, right = n >> self.half, n & self.mask
+        for i in reversed(range(self.rounds)):
+            left, right = right ^ self._round(i, left), left
+        return (left << self.half) | right
+
+
+def format_meeting_id(value: int) -> str:
+    digits = f"{value:09x}"
+    return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+
+
+def reserve_id_block(db: Session, size: int) -> int:
+    """Atomically advance the shared counter by `size`; returns the block start."""
+    stmt = (
+        update(MeetingIdSequence)
+        .where(MeetingIdSequence.id == 1)
+        .values(next_value=MeetingIdSequence.next_value + size)
+        .returning(MeetingIdSequence.next_value)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        end = db.execute(stmt).scalar()
+        if end is None:
+            # First block ever: create the counter row
+            db.add(MeetingIdSequence(id=1, next_value=size))
+            db.flush()
+            end = size
+        db.commit()
+    except IntegrityError:
+        # Another worker created the row first
+        db.rollback()
+        return reserve_id_block(db, size)
+    except Exception:
+        db.rollback()
+        raise
+    if end > 1 << ID_BITS:
+        raise RuntimeError("Meeting ID space exhausted")
+    return end - size
+
+
+class MeetingIdAllocator:
+    def __init__(self, permutation: FeistelPermutation, block_size: int):
+        self.permutation = permutation
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+        self.blocks_reserved = 0
+
+    async def allocate(self, db: Session) -> str:
+        """Next unused meeting ID; touches the database once per block."""
+        if self._next >= self._end:
+            async with self._lock:
+                if self._next >= self._end:
+                    start = await run_db(db, reserve_id_block, self.block_size)
+                    self._next, self._end = start, start + self.block_size
+                    self.blocks_reserved += 1
+        value = self._next
+        self._next += 1
+        return format_meeting_id(self.permutation.permute(value))
+
+
+meeting_ids = MeetingIdAllocator(FeistelPermutation(derive_key("meeting-id")), settings.MEETING_ID_BLOCK_SIZE)
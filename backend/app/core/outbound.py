@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Optional, Tuple
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Backpressure policies applied when a peer's outbound queue is full
+DROP_OLDEST_ICE = "drop_oldest_ice"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+POLICIES = (DROP_OLDEST_ICE, COALESCE, DISCONNECT)
+
+# A queue that is past max_size but still draining may grow to this many
+# times max_size before the policy applies regardless of lag
+BURST_FACTOR = 4
+
+
+class OutboundQueue:
+    """
+    Bounded per-connection send queue drained by a dedicated writer task.
+
+    Senders only enqueue pre-serialized frames, so a slow consumer never blocks
+    the receive loop of whoever produced the message. A full queue only counts
+    as falling behind once its oldest frame has waited longer than `max_lag`:
+    a burst enqueued before any writer had a chance to run fills every queue
+    at once, and a peer that drains it promptly must not be penalized for
+    that. Past `max_lag` (or BURST_FACTOR * max_size frames) the configured
+    policy decides what gives:
+
+    - drop_oldest_ice: discard the oldest queued ICE candidate (trickle ICE
+      tolerates losing a few); disconnect if none are queued.
+    - coalesce: skip frames identical to one already queued, then behave like
+      drop_oldest_ice.
+    - disconnect: evict the peer as soon as it falls behind.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        max_size: int,
+        policy: str,
+        send_timeout: float,
+        on_failure: Callable[["OutboundQueue"], None],
+        metrics: Optional[Counter] = None,
+        max_lag: float = 0.0,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r}, expected one of {POLICIES}")
+        self.websocket = websocket
+        self.room_id = room_id
+        self.max_size = max_size
+        self.max_lag = max_lag
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.on_failure = on_failure
+        self.metrics = metrics if metrics is not None else Counter()
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        # (kind, text, monotonic time it was enqueued)
+        self._pending: Deque[Tuple[Optional[str], str, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest unsent frame has been waiting."""
+        return time.monotonic() - self._pending[0][2] if self._pending else 0.0
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    def close(self):
+        """Stop the writer and discard anything still queued."""
+        self.closed = True
+        self._pending.clear()
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._wakeup.set()
+
+    def put(self, text: str, kind: Optional[str] = None) -> bool:
+        """
+        Enqueue a serialized frame. `kind` is the signaling message type.
+        Returns False if the peer has to be disconnected.
+        """
+        if self.closed:
+            return False
+
+        if self.policy == COALESCE and any(t == text for _, t, _ in self._pending):
+            self.coalesced += 1
+            self.metrics["coalesced"] += 1
+            return True
+
+        if self._falling_behind():
+            if self.policy == DISCONNECT or not self._drop_oldest_ice():
+                self.metrics["overflow_evictions"] += 1
+                logger.warning(f"Outbound queue full ({self.max_size}) in room {self.room_id}, disconnecting peer")
+                self.closed = True
+                self.on_failure(self)
+                return False
+
+        self._pending.append((kind, text, time.monotonic()))
+        self.metrics["enqueued"] += 1
+        self._wakeup.set()
+        return True
+
+    def _falling_behind(self) -> bool:
+        depth = len(self._pending)
+        if depth < self.max_size:
+            return False
+        if depth >= self.max_size * BURST_FACTOR:
+            return True
+        return self.lag >= self.max_lag
+
+    def _drop_oldest_ice(self) -> bool:
+        for i, (kind, _, _) in enumerate(self._pending):
+            if kind == "ice-candidate":
+                del self._pending[i]
+                self.dropped += 1
+                self.metrics["dropped_ice"] += 1
+                return True
+        return False
+
+    async def _writer(self):
+        while not self.closed:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            _, text, _ = self._pending.popleft()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(text), timeout=self.send_timeout)
+                self.metrics["sent"] += 1
+            except asyncio.TimeoutError:
+                logger.warning(f"WebSocket send timed out after {self.send_timeout}s, evicting peer")
+                self._fail()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket send failed, evicting peer: {e}")
+                self._fail()
+                return
+
+    def _fail(self):
+        self.metrics["send_failures"] += 1
+        self.closed = True
+        self.on_failure(self)
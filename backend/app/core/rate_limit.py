@@ -0,0 +1,134 @@
+import logging
+import time
+from typing import Any, Dict, Tuple
+
+from .cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class BucketStorage:
+    """
+    Where token buckets live. `take` refills the bucket for `key`, tries to
+    remove one token and returns (allowed, seconds until a token is free).
+    """
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class InMemoryBucketStorage(BucketStorage):
+    """Per-worker buckets. A bucket untouched long enough to refill is dropped."""
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._buckets: Dict[float, TTLCache] = {}
+
+    def _table(self, capacity: float, rate: float) -> TTLCache:
+        full_refill = capacity / rate
+        table = self._buckets.get(full_refill)
+        if table is None:
+            table = self._buckets[full_refill] = TTLCache(self.max_size, full_refill)
+        return table
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        table = self._table(capacity, rate)
+        now = time.monotonic()
+        bucket = table.get(key)
+        if bucket is MISSING:
+            tokens = capacity
+        else:
+            tokens, updated = bucket
+            tokens = min(capacity, tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        table.set(key, (tokens, now))
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+# Refill + take in one round trip, atomically for all workers
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStorage(BucketStorage):
+    """Buckets shared by all workers. Fails open if Redis is unavailable."""
+
+    def __init__(self, url: str, prefix: str = "zoom:ratelimit"):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("Redis rate-limit storage requires the 'redis' package") from e
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self._take(keys=[f"{self.prefix}:{key}"], args=[capacity, rate, time.time()])
+        except Exception as e:
+            logger.warning(f"Rate limiter: Redis unavailable, allowing request: {e}")
+            return True, 0.0
+        if int(allowed):
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+class TokenBucketLimiter:
+    """`capacity` attempts in a burst, refilled at `rate` per second."""
+
+    def __init__(self, capacity: float, rate: float, storage: BucketStorage):
+        self.capacity = capacity
+        self.rate = rate
+        self.storage = storage
+        self.allowed = 0
+        self.limited = 0
+
+    async def hit(self, key: str) -> Tuple[bool, float]:
+        allowed, retry_after = await self.storage.take(key, self.capacity, self.rate)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return allowed, retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "rate": self.rate,
+            "storage": type(self.storage).__name__,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+def create_bucket_storage(kind: str, redis_url: str = "") -> BucketStorage:
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("JOIN_RATE_STORAGE=redis requires REDIS_URL to be set")
+        return RedisBucketStorage(redis_url)
+    if kind == "memory":
+        return InMemoryBucketStorage()
+    raise ValueError(f"Unknown JOIN_RATE_STORAGE {kind!r}, expected 'memory' or 'redis'")
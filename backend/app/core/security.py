@@ -1,20 +1,101 @@
-import httpx
-import jwt
+import asyncio
 import json
 import base64
+import hashlib
 import time
 import logging
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 
+from .cache import MISSING, TTLCache
 from .config import settings
+from .http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# JWKS cache – avoids fetching Clerk's public keys on every request
+# JWKS cache – avoids fetching Clerk's public keys on every request.
+# "keys" is an index of ready-to-use public key objects: {kid: key}
 # ---------------------------------------------------------------------------
-_jwks_cache: Dict[str, Any] = {"keys": [], "fetched_at": 0}
+_jwks_cache: Dict[str, Any] = {"keys": {}, "fetched_at": 0}
 _JWKS_CACHE_TTL = 3600  # seconds
+_JWKS_MIN_REFRESH_INTERVAL = 30  # seconds between forced refetches for unknown kids
+_JWKS_REFRESH_AHEAD = 0.8  # background refresher renews at 80% of the TTL
+_JWKS_RETRY_INTERVAL = 30  # seconds between background retries while Clerk is unreachable
+_jwks_lock = asyncio.Lock()
+_jwks_refresh_task: Optional[asyncio.Task] = None
+_jwks_refresher: Optional[asyncio.Task] = None
+
+
+# ---------------------------------------------------------------------------
+# Verified-token cache – skips RSA verification for tokens seen recently
+# ---------------------------------------------------------------------------
+class _VerifiedTokenCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by a SHA-256 of the raw token.
+    Entries expire at the token's `exp` (or after `ttl`, whichever is first).
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = self._key(token)
+        self._entries[key] = (claims, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_token_cache = _VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL)
+
+
+def token_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the verified-token cache."""
+    return _token_cache.stats()
 
 
 def _get_clerk_frontend_api() -> str:
@@ -40,25 +121,123 @@ def _get_jwks_url() -> str:
     return f"https://{domain}/.well-known/jwks.json"
 
 
-async def _fetch_jwks() -> list:
-    """Fetch (or return cached) JSON Web Key Set from Clerk."""
-    global _jwks_cache
-    now = time.time()
-    if _jwks_cache["keys"] and (now - _jwks_cache["fetched_at"]) < _JWKS_CACHE_TTL:
-        return _jwks_cache["keys"]
+def _build_key_index(jwks: list) -> Dict[str, Any]:
+    """Parse a JWKS key list into {kid: public key object}."""
+    # PyJWT + cryptography are imported on first use to keep app import fast
+    import jwt
+
+    index = {}
+    for jwk in jwks:
+        kid = jwk.get("kid")
+        if not kid or jwk.get("kty") != "RSA":
+            continue
+        try:
+            index[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        except Exception as e:
+            logger.warning(f"Skipping unusable JWKS key kid={kid}: {e}")
+    return index
+
 
-    jwks_url = _get_jwks_url()
-    logger.info(f"Fetching JWKS from {jwks_url}")
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(jwks_url, timeout=10.0)
+async def _refresh_jwks(requested_at: float) -> Dict[str, Any]:
+    """
+    Single-flight JWKS refresh. Concurrent callers wait on one fetch; anyone
+    whose request started before the last successful refresh reuses its result.
+    """
+    async with _jwks_lock:
+        if _jwks_cache["keys"] and _jwks_cache["fetched_at"] >= requested_at:
+            return _jwks_cache["keys"]
+
+        jwks_url = _get_jwks_url()
+        logger.info(f"Fetching JWKS from {jwks_url}")
+        resp = await get_http_client().get(jwks_url)
         resp.raise_for_status()
         data = resp.json()
-        _jwks_cache["keys"] = data.get("keys", [])
-        _jwks_cache["fetched_at"] = now
+        _jwks_cache["keys"] = _build_key_index(data.get("keys", []))
+        _jwks_cache["fetched_at"] = time.time()
         logger.info(f"JWKS fetched successfully, {len(_jwks_cache['keys'])} key(s)")
         return _jwks_cache["keys"]
 
 
+async def _fetch_jwks() -> Dict[str, Any]:
+    """
+    Return the (cached) kid → public key index from Clerk's JWKS.
+
+    Stale-while-revalidate: once keys are known, an expired cache is served
+    as-is while a refresh runs in the background. Only the very first call
+    (no keys yet) waits on Clerk.
+    """
+    now = time.time()
+    if _jwks_cache["keys"]:
+        if (now - _jwks_cache["fetched_at"]) >= _JWKS_CACHE_TTL:
+            _revalidate_jwks_in_background()
+        return _jwks_cache["keys"]
+    return await _refresh_jwks(now - _JWKS_CACHE_TTL)
+
+
+def _revalidate_jwks_in_background():
+    global _jwks_refresh_task
+    if _jwks_refresh_task is None or _jwks_refresh_task.done():
+        _jwks_refresh_task = asyncio.create_task(_try_refresh_jwks())
+
+
+async def _try_refresh_jwks() -> bool:
+    """Refresh the JWKS, keeping the last known good keys if Clerk is unreachable."""
+    try:
+        await _refresh_jwks(time.time() - _JWKS_CACHE_TTL * _JWKS_REFRESH_AHEAD)
+        return True
+    except Exception as e:
+        logger.warning(f"JWKS refresh failed, serving {len(_jwks_cache['keys'])} cached key(s): {e}")
+        return False
+
+
+async def _jwks_refresh_loop():
+    while True:
+        ok = await _try_refresh_jwks()
+        if ok:
+            age = time.time() - _jwks_cache["fetched_at"]
+            delay = max(_JWKS_CACHE_TTL * _JWKS_REFRESH_AHEAD - age, _JWKS_RETRY_INTERVAL)
+        else:
+            delay = _JWKS_RETRY_INTERVAL
+        await asyncio.sleep(delay)
+
+
+def start_jwks_refresher():
+    """Start renewing the JWKS ahead of expiry. Called from the app lifespan."""
+    global _jwks_refresher
+    if not settings.CLERK_PUBLISHABLE_KEY:
+        logger.warning("CLERK_PUBLISHABLE_KEY is not set, JWKS refresher not started")
+        return
+    if _jwks_refresher is None or _jwks_refresher.done():
+        _jwks_refresher = asyncio.create_task(_jwks_refresh_loop())
+
+
+async def stop_jwks_refresher():
+    global _jwks_refresher
+    if _jwks_refresher is not None:
+        _jwks_refresher.cancel()
+        try:
+            await _jwks_refresher
+        except asyncio.CancelledError:
+            pass
+        _jwks_refresher = None
+
+
+async def _get_signing_key(kid: str) -> Optional[Any]:
+    """
+    Look up the public key for `kid`, refetching the key set at most once per
+    _JWKS_MIN_REFRESH_INTERVAL when the kid is unknown (e.g. after key rotation).
+    """
+    keys = await _fetch_jwks()
+    key = keys.get(kid)
+    if key is not None:
+        return key
+
+    logger.error(f"No JWKS key found matching kid={kid}")
+    logger.info(f"Available keys: {list(keys)}")
+    keys = await _refresh_jwks(time.time() - _JWKS_MIN_REFRESH_INTERVAL)
+    return keys.get(kid)
+
+
 def _decode_jwt_payload_unsafe(token: str) -> Optional[Dict[str, Any]]:
     """Decode JWT payload WITHOUT verification (for extracting claims like kid)."""
     try:
@@ -91,23 +270,24 @@ async def verify_clerk_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Verify a Clerk session JWT using Clerk's JWKS public keys.
 
-    1. Fetch (cached) JWKS from Clerk's well-known endpoint
-    2. Match the JWT's `kid` header to a JWKS key
+    0. Return cached claims if this exact token was verified recently
+    1. Read the `kid` from the JWT header
+    2. Look it up in the cached kid → public key index built from Clerk's JWKS
     3. Verify signature and decode claims using PyJWT
     4. Return the verified payload, or None on failure.
     """
+    import jwt
+
     try:
         if not token:
             logger.error("Token is empty")
             return None
-            
-        # 1. Get JWKS keys
-        jwks_keys = await _fetch_jwks()
-        if not jwks_keys:
-            logger.error("No JWKS keys available from Clerk")
-            return None
 
-        # 2. Get the kid from the token header
+        cached = _token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        # 1. Get the kid from the token header
         header = _decode_jwt_header(token)
         if not header:
             logger.error("Could not decode JWT header")
@@ -115,29 +295,13 @@ async def verify_clerk_token(token: str) -> Optional[Dict[str, Any]]:
         kid = header.get("kid")
         logger.info(f"Token kid: {kid}")
 
-        # 3. Find matching public key
-        matching_key = None
-        for key in jwks_keys:
-            if key.get("kid") == kid:
-                matching_key = key
-                break
-
-        if not matching_key:
-            logger.error(f"No JWKS key found matching kid={kid}")
-            logger.info(f"Available keys: {[k.get('kid') for k in jwks_keys]}")
-            # Invalidate cache and retry once
-            _jwks_cache["fetched_at"] = 0
-            jwks_keys = await _fetch_jwks()
-            for key in jwks_keys:
-                if key.get("kid") == kid:
-                    matching_key = key
-                    break
-            if not matching_key:
-                logger.error(f"Still no JWKS key found for kid={kid} after refresh")
-                return None
-
-        # 4. Build the public key and verify
-        public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(matching_key))
+        # 2. Look up the pre-parsed public key (refreshing the JWKS if needed)
+        public_key = await _get_signing_key(kid)
+        if public_key is None:
+            logger.error(f"Still no JWKS key found for kid={kid} after refresh")
+            return None
+
+        # 3. Verify signature and decode claims
         payload = jwt.decode(
             token,
             public_key,
@@ -149,6 +313,7 @@ async def verify_clerk_token(token: str) -> Optional[Dict[str, Any]]:
         )
 
         logger.info(f"Clerk JWT verified successfully for sub={payload.get('sub')}")
+        _token_cache.put(token, payload)
         return payload
 
     except jwt.ExpiredSignatureError:
@@ -169,36 +334,86 @@ async def fetch_clerk_user(user_id: str) -> Optional[Dict[str, Any]]:
     Uses CLERK_SECRET_KEY as bearer auth.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"https://api.clerk.com/v1/users/{user_id}",
-                headers={"Authorization": f"Bearer {settings.CLERK_SECRET_KEY}"},
-                timeout=10.0,
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                # Extract email from email_addresses array
-                email = None
-                email_addresses = data.get("email_addresses", [])
-                if email_addresses:
-                    # Find the primary email or use the first one
-                    primary_id = data.get("primary_email_address_id")
-                    for ea in email_addresses:
-                        if ea.get("id") == primary_id:
-                            email = ea.get("email_address")
-                            break
-                    if not email and email_addresses:
-                        email = email_addresses[0].get("email_address")
-
-                return {
-                    "id": data.get("id"),
-                    "email": email,
-                    "first_name": data.get("first_name"),
-                    "last_name": data.get("last_name"),
-                }
-            else:
-                logger.error(f"Clerk Users API returned {resp.status_code}: {resp.text[:200]}")
-                return None
+        resp = await get_http_client().get(
+            f"https://api.clerk.com/v1/users/{user_id}",
+            headers={"Authorization": f"Bearer {settings.CLERK_SECRET_KEY}"},
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            # Extract email from email_addresses array
+            email = None
+            email_addresses = data.get("email_addresses", [])
+            if email_addresses:
+                # Find the primary email or use the first one
+                primary_id = data.get("primary_email_address_id")
+                for ea in email_addresses:
+                    if ea.get("id") == primary_id:
+                        email = ea.get("email_address")
+                        break
+                if not email and email_addresses:
+                    email = email_addresses[0].get("email_address")
+
+            return {
+                "id": data.get("id"),
+                "email": email,
+                "first_name": data.get("first_name"),
+                "last_name": data.get("last_name"),
+            }
+        else:
+            logger.error(f"Clerk Users API returned {resp.status_code}: {resp.text[:200]}")
+            return None
     except Exception as e:
         logger.error(f"Error fetching Clerk user {user_id}: {e}")
         return None
+
+
+# ---------------------------------------------------------------------------
+# Clerk profile cache – keyed by `sub`, failures are cached briefly too
+# ---------------------------------------------------------------------------
+_profile_cache = TTLCache(settings.CLERK_PROFILE_CACHE_SIZE, settings.CLERK_PROFILE_CACHE_TTL)
+_profile_inflight: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+
+
+async def get_clerk_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached wrapper around fetch_clerk_user. Concurrent lookups for the same
+    user share one Users API call; a failed lookup is remembered for
+    CLERK_PROFILE_NEGATIVE_TTL seconds so errors don't turn into a retry storm.
+    """
+    cached = _profile_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
+
+    inflight = _profile_inflight.get(user_id)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _profile_inflight[user_id] = future
+    try:
+        profile = await fetch_clerk_user(user_id)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        # Coalesced waiters see the same error the leader does
+        future.set_exception(e)
+        future.exception()  # retrieved here; the leader re-raises it below
+        raise
+    finally:
+        del _profile_inflight[user_id]
+
+    if profile is None:
+        _profile_cache.set(user_id, None, ttl=settings.CLERK_PROFILE_NEGATIVE_TTL)
+    else:
+        _profile_cache.set(user_id, profile)
+    future.set_result(profile)
+    return profile
+
+
+def invalidate_clerk_profile(user_id: str):
+    _profile_cache.pop(user_id)
+
+
+def profile_cache_stats() -> Dict[str, Any]:
+    return _profile_cache.stats()
@@ -0,0 +1,76 @@
+"""
+Short-lived signed join tickets for the signaling WebSocket.
+
+/meetings/join issues a ticket once the password has been verified; the
+/ws handshake checks it with a single HMAC, no database access, and
+refuses the socket before accept() if it is missing, forged, expired or
+for another room.
+
+A ticket that has expired can still be exchanged for a fresh one through
+POST /meetings/ticket for WS_TICKET_RENEW_WINDOW seconds, so reloading the
+room later does not need the meeting password again.
+
+    <base64url("meeting_id:user_id:expires_at")>.<base64url(hmac-sha256[:16])>
+"""
+import base64
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from .config import settings
+from .keys import derive_key
+
+_SIGNATURE_BYTES = 16
+
+
+class JoinTicket:
+    __slots__ = ("meeting_id", "user_id", "expires_at")
+
+    def __init__(self, meeting_id: str, user_id: int, expires_at: int):
+        self.meeting_id = meeting_id
+        self.user_id = user_id
+        self.expires_at = expires_at
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(derive_key("ws-join-ticket"), payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def issue_join_ticket(meeting_id: str, user_id: int, ttl: Optional[float] = None) -> str:
+    expires_at = int(time.time() + (settings.WS_TICKET_TTL if ttl is None else ttl))
+    payload = f"{meeting_id}:{user_id}:{expires_at}".encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_join_ticket(ticket: Optional[str], room_id: str, leeway: float = 0.0) -> Optional[JoinTicket]:
+    """
+    The ticket's claims if it is authentic, for `room_id` and expired less
+    than `leeway` seconds ago; else None.
+    """
+    if not ticket or "." not in ticket:
+        return None
+    try:
+        encoded_payload, encoded_signature = ticket.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        meeting_id, user_id, expires_at = payload.decode().rsplit(":", 2)
+        claims = JoinTicket(meeting_id, int(user_id), int(expires_at))
+    except ValueError:
+        return None
+    if claims.meeting_id != room_id or claims.expires_at + leeway < time.time():
+        return None
+    return claims
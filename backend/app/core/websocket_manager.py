@@ -1,28 +1,443 @@
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
 from fastapi import WebSocket
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from . import codec
+from .backplane import Backplane, create_backplane
+from .config import settings
+from .ice_batching import ICE_BATCH_CAPABILITY, IceCandidateBatcher
+from .outbound import OutboundQueue
+from .tickets import issue_join_ticket
+
+logger = logging.getLogger(__name__)
+
+
+class PeerConnection:
+    """
+    Bookkeeping for one live socket. Hashes by identity, so records can live
+    in per-room sets with O(1) add/remove.
+    """
+
+    __slots__ = ("websocket", "room_id", "peer_id", "user_id", "joined_at", "last_seen", "queue", "capabilities")
+
+    def __init__(self, websocket: WebSocket, room_id: str, queue: OutboundQueue, user_id: Optional[int] = None):
+        self.websocket = websocket
+        self.room_id = room_id
+        self.peer_id: Optional[str] = None
+        # Authenticated user from the join ticket
+        self.user_id = user_id
+        self.joined_at = time.time()
+        # monotonic time of the last inbound frame (any message or pong)
+        self.last_seen = time.monotonic()
+        self.queue = queue
+        self.capabilities: frozenset = frozenset()
+
+    def roster_entry(self) -> Dict[str, Any]:
+        return {"peerId": self.peer_id, "userId": self.user_id, "joinedAt": self.joined_at}
+
 
 class ConnectionManager:
-    def __init__(self):
-        # Dictionary to store active connections: {room_id: [list_of_websockets]}
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    def __init__(
+        self,
+        send_timeout: float = settings.WS_SEND_TIMEOUT,
+        queue_size: int = settings.WS_OUTBOUND_QUEUE_SIZE,
+        max_queue_lag: float = settings.WS_OUTBOUND_MAX_LAG,
+        backpressure_policy: str = settings.WS_BACKPRESSURE_POLICY,
+        backplane: Optional[Backplane] = None,
+        ice_batch_window: float = settings.WS_ICE_BATCH_WINDOW_MS / 1000,
+        ping_interval: float = settings.WS_PING_INTERVAL,
+        ping_timeout: float = settings.WS_PING_TIMEOUT,
+    ):
+        # Active connections per room: {room_id: {PeerConnection, ...}}
+        self.active_connections: Dict[str, Set[PeerConnection]] = {}
+        # Reverse index: socket -> its record (room, peer ID, outbound queue)
+        self.connections: Dict[WebSocket, PeerConnection] = {}
+        # Signaling peer IDs announced in "join": {room_id: {peer_id: record}}
+        self.peers: Dict[str, Dict[str, PeerConnection]] = {}
+        self.metrics: Counter = Counter()
+        # Upper bound for a single send; slower peers are evicted
+        self.send_timeout = send_timeout
+        self.queue_size = queue_size
+        self.max_queue_lag = max_queue_lag
+        self.backpressure_policy = backpressure_policy
+        # Carries frames to peers connected to other workers/nodes
+        self.backplane = backplane or create_backplane(settings.WS_BACKPLANE, settings.REDIS_URL)
+        self._backplane_started = False
+        # Trickled ICE candidates are coalesced for peers that opt in
+        self.ice_batcher = IceCandidateBatcher(ice_batch_window, self._deliver_ice_batch)
+        # Application-level heartbeat: peers silent for ping_timeout are reaped
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Set while shutting down: new sockets are refused, live ones told to move
+        self.draining = False
+        self._drain_task: Optional[asyncio.Task] = None
+        # Rooms whose count/roster changed since they were last published
+        self._presence_dirty: Set[str] = set()
+        self._presence_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Attach to the backplane and start heartbeats. Called lazily on the first connection."""
+        if not self._backplane_started:
+            self._backplane_started = True
+            await self.backplane.start(self._on_backplane_message)
+        if self.ping_interval > 0 and self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
 
-    async def connect(self, websocket: WebSocket, room_id: str):
+    async def close(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self._presence_task is not None:
+            self._presence_task.cancel()
+            self._presence_task = None
+        if self._backplane_started:
+            self._backplane_started = False
+            await self.backplane.close()
+
+    async def connect(self, websocket: WebSocket, room_id: str, user_id: Optional[int] = None) -> PeerConnection:
         await websocket.accept()
+        await self.start()
+        # Each socket gets a bounded outbound queue drained by its own writer task
+        queue = OutboundQueue(
+            websocket,
+            room_id,
+            max_size=self.queue_size,
+            policy=self.backpressure_policy,
+            send_timeout=self.send_timeout,
+            on_failure=self._on_queue_failure,
+            metrics=self.metrics,
+            max_lag=self.max_queue_lag,
+        )
+        conn = PeerConnection(websocket, room_id, queue, user_id=user_id)
         if room_id not in self.active_connections:
-            self.active_connections[room_id] = []
-        self.active_connections[room_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, room_id: str):
-        if room_id in self.active_connections:
-            self.active_connections[room_id].remove(websocket)
-            if not self.active_connections[room_id]:
-                del self.active_connections[room_id]
-
-    async def broadcast_to_room(self, message: dict, room_id: str, sender: WebSocket):
-        """Send a message to everyone in the room except the sender."""
-        if room_id in self.active_connections:
-            for connection in self.active_connections[room_id]:
-                if connection != sender:
-                    await connection.send_json(message)
-
-manager = ConnectionManager()
\ No newline at end of file
+            self.active_connections[room_id] = set()
+            await self.backplane.subscribe(room_id)
+        self.active_connections[room_id].add(conn)
+        self.connections[websocket] = conn
+        queue.start()
+        self._mark_presence(room_id)
+        return conn
+
+    def disconnect(self, websocket: WebSocket, room_id: Optional[str] = None) -> Optional[PeerConnection]:
+        """
+        Forget a socket. Safe to call more than once; `room_id` is optional.
+        Returns the removed record, or None if it was already gone, so only
+        the caller that actually removed a peer announces its departure.
+        """
+        conn = self.connections.pop(websocket, None)
+        if conn is None:
+            return None
+        conn.queue.close()
+        self.ice_batcher.discard(conn)
+        room = self.active_connections.get(conn.room_id)
+        if room is not None:
+            room.discard(conn)
+            if not room:
+                del self.active_connections[conn.room_id]
+                self._release_room(conn.room_id)
+        room_peers = self.peers.get(conn.room_id)
+        if conn.peer_id is not None and room_peers and room_peers.get(conn.peer_id) is conn:
+            del room_peers[conn.peer_id]
+            if not room_peers:
+                del self.peers[conn.room_id]
+        self._mark_presence(conn.room_id)
+        return conn
+
+    async def register_peer(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        peer_id: str,
+        capabilities: Iterable[str] = (),
+    ) -> bool:
+        """
+        Associate the signaling peer ID from a "join" message with its socket,
+        along with any protocol capabilities the client advertised, and send
+        the joiner a `roster` of the peers already in the room, on this and
+        every other worker.
+
+        Returns False, registering nothing, when another live socket holds
+        `peer_id` for a different user: taking it over would route that
+        peer's offers, answers and candidates to whoever claimed its ID.
+        """
+        conn = self.connections.get(websocket)
+        if conn is None:
+            return False
+        room_peers = self.peers.setdefault(conn.room_id, {})
+        holder = room_peers.get(peer_id)
+        if (
+            holder is not None
+            and holder is not conn
+            and holder.websocket in self.connections
+            and (holder.user_id is None or holder.user_id != conn.user_id)
+        ):
+            self.metrics["peer_id_conflicts"] += 1
+            logger.warning(f"Peer ID {peer_id} is already taken in room {conn.room_id}, refusing join")
+            return False
+        conn.capabilities = frozenset(capabilities)
+        first_join = conn.peer_id is None
+        if first_join:
+            # Taken before this peer is added, so it lists everyone else
+            roster = self._local_roster(conn.room_id)
+        if conn.peer_id is not None and conn.peer_id != peer_id and room_peers.get(conn.peer_id) is conn:
+            del room_peers[conn.peer_id]
+        conn.peer_id = peer_id
+        room_peers[peer_id] = conn
+        self._mark_presence(conn.room_id)
+        if first_join:
+            remote = await self.backplane.remote_presence([conn.room_id])
+            roster.extend(peer for node in remote.get(conn.room_id, ()) for peer in node["peers"])
+            conn.queue.put(codec.dumps({"type": "roster", "peers": roster}), "roster")
+        return True
+
+    def _local_roster(self, room_id: str) -> List[Dict[str, Any]]:
+        return [peer.roster_entry() for peer in self.peers.get(room_id, {}).values()]
+
+    async def roster(self, room_id: str) -> List[Dict[str, Any]]:
+        """Peers that have announced themselves in `room_id`, on every worker."""
+        roster = self._local_roster(room_id)
+        remote = await self.backplane.remote_presence([room_id])
+        roster.extend(peer for node in remote.get(room_id, ()) for peer in node["peers"])
+        return roster
+
+    async def occupancy(self, room_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Live connection count per room across all workers: this worker's
+        own sets plus one backplane round trip for the whole batch.
+        """
+        room_ids = list(room_ids)
+        counts = {room_id: len(self.active_connections.get(room_id, ())) for room_id in room_ids}
+        remote = await self.backplane.remote_presence(room_ids)
+        for room_id, nodes in remote.items():
+            counts[room_id] += sum(node["count"] for node in nodes)
+        return counts
+
+    def _mark_presence(self, room_id: str):
+        """Queue `room_id` for publishing; one task writes rooms in order, latest state wins."""
+        self._presence_dirty.add(room_id)
+        if self._presence_task is None or self._presence_task.done():
+            try:
+                self._presence_task = asyncio.get_running_loop().create_task(self._flush_presence())
+            except RuntimeError:
+                pass
+
+    async def _flush_presence(self):
+        while self._presence_dirty:
+            room_id = self._presence_dirty.pop()
+            try:
+                await self.backplane.publish_presence(
+                    room_id,
+                    len(self.active_connections.get(room_id, ())),
+                    self._local_roster(room_id),
+                )
+            except Exception as e:
+                logger.warning(f"Presence publish failed for room {room_id}: {e}")
+
+    def get_peer_id(self, websocket: WebSocket) -> Optional[str]:
+        conn = self.connections.get(websocket)
+        return conn.peer_id if conn else None
+
+    def _release_room(self, room_id: str):
+        """Drop the backplane subscription once the last local peer has left."""
+        async def unsubscribe():
+            if room_id not in self.active_connections:
+                await self.backplane.unsubscribe(room_id)
+
+        try:
+            asyncio.get_running_loop().create_task(unsubscribe())
+        except RuntimeError:
+            pass
+
+    async def _on_backplane_message(self, envelope: Dict[str, Any]):
+        """Deliver a frame published by another worker to the local peers."""
+        room_id = envelope["room"]
+        target_id = envelope.get("target")
+        if target_id:
+            target = self.peers.get(room_id, {}).get(target_id)
+            recipients = (target,) if target is not None else ()
+        else:
+            recipients = tuple(self.active_connections.get(room_id, ()))
+        for conn in recipients:
+            conn.queue.put(envelope["data"], envelope.get("kind"))
+
+    async def _publish(self, room_id: str, text: str, kind: Optional[str], target: Optional[str] = None):
+        try:
+            await self.backplane.publish(self.backplane.envelope(room_id, text, kind, target))
+        except Exception as e:
+            logger.error(f"Backplane publish failed for room {room_id}: {e}")
+
+    def _on_queue_failure(self, queue: OutboundQueue):
+        """Evict a peer whose writer failed, timed out or overflowed its queue."""
+        conn = self.disconnect(queue.websocket)
+        if conn is not None:
+            asyncio.get_running_loop().create_task(self._evict(conn))
+
+    async def _close_socket(self, websocket: WebSocket, code: int = 1000):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    async def _evict(self, conn: PeerConnection):
+        """Close an already-disconnected peer's socket and tell the room."""
+        await self._close_socket(conn.websocket)
+        await self.announce_departure(conn)
+
+    async def announce_departure(self, conn: PeerConnection):
+        await self.broadcast_to_room(
+            {"type": "user-left", "senderId": conn.peer_id, "message": "A participant has left the call"},
+            conn.room_id,
+            sender=conn.websocket,
+        )
+
+    async def _heartbeat(self):
+        ping = codec.dumps({"type": "ping"})
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                self.reap_idle(ping)
+            except Exception as e:
+                logger.error(f"WebSocket heartbeat failed: {e}")
+
+    def reap_idle(self, ping: Optional[str] = None) -> int:
+        """
+        Evict peers that have sent nothing (not even a pong) for
+        ping_timeout seconds and ping the rest. Returns the number reaped.
+        """
+        deadline = time.monotonic() - self.ping_timeout
+        reaped = 0
+        for conn in tuple(self.connections.values()):
+            if conn.last_seen < deadline:
+                if self.disconnect(conn.websocket) is not None:
+                    reaped += 1
+                    asyncio.get_running_loop().create_task(self._evict(conn))
+            elif ping is not None:
+                conn.queue.put(ping, "ping")
+        if reaped:
+            self.metrics["ghosts_reaped"] += reaped
+            logger.info(f"Reaped {reaped} idle WebSocket connection(s)")
+        return reaped
+
+    def _deliver_ice_batch(self, target: PeerConnection, sender_id: str, candidates: List[Any]):
+        frame = {
+            "type": "ice-candidates",
+            "senderId": sender_id,
+            "targetId": target.peer_id,
+            "candidates": candidates,
+        }
+        self.metrics["ice_batches"] += 1
+        self.metrics["ice_batched_candidates"] += len(candidates)
+        target.queue.put(codec.dumps(frame), "ice-candidates")
+
+    async def broadcast_to_room(
+        self, message: dict, room_id: str, sender: WebSocket, raw: Optional[str] = None
+    ):
+        """
+        Send a message to everyone in the room except the sender.
+
+        The message is serialized once and handed to every peer's outbound
+        queue; the per-connection writers deliver it concurrently, so a slow
+        or stalled peer cannot delay delivery to the rest of the room.
+        Iterates over a snapshot, so peers evicted mid-broadcast are harmless.
+        `raw` is the frame as received; when given it is forwarded unchanged.
+        """
+        text = raw if raw is not None else codec.dumps(message)
+        kind = message.get("type")
+        for conn in tuple(self.active_connections.get(room_id, ())):
+            if conn.websocket is not sender:
+                conn.queue.put(text, kind)
+        # Peers in the same room on other workers
+        await self._publish(room_id, text, kind)
+
+    async def send_to_peer(
+        self, message: dict, room_id: str, target_id: str, raw: Optional[str] = None
+    ) -> bool:
+        """
+        Deliver a message to a single peer. Returns True if the peer is local;
+        otherwise the message is published for whichever worker holds it.
+        """
+        target = self.peers.get(room_id, {}).get(target_id)
+        kind = message.get("type")
+        if target is None:
+            text = raw if raw is not None else codec.dumps(message)
+            await self._publish(room_id, text, kind, target=target_id)
+            return False
+
+        sender_id = message.get("senderId")
+        if self.ice_batcher.enabled and ICE_BATCH_CAPABILITY in target.capabilities:
+            if kind == "ice-candidate" and sender_id and "candidate" in message:
+                self.ice_batcher.add(target, sender_id, message["candidate"])
+                return True
+            # Keep ordering: buffered candidates go out before the next offer/answer
+            self.ice_batcher.flush(target, sender_id)
+        target.queue.put(raw if raw is not None else codec.dumps(message), kind)
+        return True
+
+    async def route(self, message: dict, room_id: str, sender: WebSocket, raw: Optional[str] = None):
+        """
+        Relay a signaling message: unicast when it names a `targetId`,
+        broadcast to the rest of the room otherwise.
+        """
+        target_id = message.get("targetId")
+        if target_id:
+            await self.send_to_peer(message, room_id, target_id, raw=raw)
+            return
+        await self.broadcast_to_room(message, room_id, sender, raw=raw)
+
+    def drain(self, timeout: float, jitter_ms: int) -> "asyncio.Task":
+        """
+        Start draining (idempotent) and return the task doing it.
+
+        Every peer gets {"type": "reconnect", "retryAfterMs": ..., "ticket": ...}
+        with a random delay in [0, jitter_ms], so clients move to another
+        worker spread out over time instead of all at once, plus a fresh
+        join ticket for their room. Peers still connected after `timeout`
+        seconds are closed with 1012 (service restart).
+        """
+        if self._drain_task is None:
+            self.draining = True
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain(timeout, jitter_ms))
+        return self._drain_task
+
+    async def _drain(self, timeout: float, jitter_ms: int):
+        live = tuple(self.connections.values())
+        logger.info(f"Draining {len(live)} WebSocket connection(s), deadline {timeout}s")
+        for conn in live:
+            hint = {"type": "reconnect", "retryAfterMs": random.randint(0, max(jitter_ms, 0))}
+            if conn.user_id is not None:
+                hint["ticket"] = issue_join_ticket(conn.room_id, conn.user_id)
+            conn.queue.put(codec.dumps(hint), "reconnect")
+        self.metrics["drain_reconnect_hints"] += len(live)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.connections and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+
+        remaining = tuple(self.connections.values())
+        for conn in remaining:
+            self.disconnect(conn.websocket)
+        await asyncio.gather(*(self._close_socket(conn.websocket, code=1012) for conn in remaining))
+        self.metrics["drain_forced_closes"] += len(remaining)
+        logger.info(f"Drain finished: {len(live) - len(remaining)} left on their own, {len(remaining)} closed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and drop counters across all local connections."""
+        depths = [conn.queue.depth for conn in self.connections.values()]
+        return {
+            "rooms": len(self.active_connections),
+            "connections": len(self.connections),
+            "queue_depth": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "max_queue_lag": max((conn.queue.lag for conn in self.connections.values()), default=0.0),
+            "backpressure_policy": self.backpressure_policy,
+            "draining": self.draining,
+            **self.metrics,
+        }
+
+manager = ConnectionManager()
@@ -1,12 +1,17 @@
 import logging
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from .session import SessionLocal
+from .session import SessionLocal, AsyncSessionLocal, run_db
+from ..core.config import settings
 from ..models.user import User
-from ..core.security import verify_clerk_token, fetch_clerk_user
+from ..core.security import verify_clerk_token, get_clerk_profile
+from ..core.identity import CurrentUser, get_cached_identity, remember_identity
+
+PLACEHOLDER_EMAIL_DOMAIN = "@clerk.placeholder"
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +19,7 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-def get_db():
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -22,13 +27,32 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Routes depend on get_db and hand their query code to run_db(), so DB_ASYNC
+# alone decides whether they get a sync Session or an AsyncSession.
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+
+
+def _stored_profile(db: Session, clerk_id: str):
+    """Email and names already stored for this Clerk user, if any."""
+    return db.query(User.email, User.first_name, User.last_name).filter(
+        User.clerk_id == clerk_id
+    ).first()
+
+
 async def get_clerk_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
 ):
     """
     Verify the Clerk session JWT using JWKS and return user claims.
-    If the JWT doesn't contain an email, fetch user details from Clerk's Users API.
+    If the JWT doesn't contain an email, use the one stored in the users table;
+    only new or placeholder users are looked up in Clerk's Users API (cached).
     """
     token = credentials.credentials
     logger.info(f"Auth: token present={bool(token)}, length={len(token) if token else 0}")
@@ -56,10 +80,19 @@ async def get_clerk_user(
     given_name = payload.get("given_name") or payload.get("first_name")
     family_name = payload.get("family_name") or payload.get("last_name")
 
-    # 2. Clerk session JWTs often lack email — fetch from Users API
+    # 2. Clerk session JWTs often lack email — the users table is the source
+    #    of truth once a real email is known (checked via the identity cache first)
+    if not email and sub:
+        stored = get_cached_identity(sub) or await run_db(db, _stored_profile, sub)
+        if stored and not _is_placeholder(stored.email):
+            email = stored.email
+            given_name = given_name or stored.first_name
+            family_name = family_name or stored.last_name
+
+    # 3. Genuinely new or placeholder users — ask Clerk's Users API
     if not email and sub:
         logger.info(f"Email missing from JWT for sub={sub}, fetching from Clerk Users API")
-        user_data = await fetch_clerk_user(sub)
+        user_data = await get_clerk_profile(sub)
         if user_data:
             email = user_data.get("email")
             if not given_name:
@@ -75,31 +108,37 @@ async def get_clerk_user(
     }
 
 
-def get_current_user(
-    clerk_user: dict = Depends(get_clerk_user),
-    db: Session = Depends(get_db),
-):
-    """
-    Get or create user in database based on Clerk authentication.
-    """
-    clerk_id = clerk_user.get("sub")
-    email = clerk_user.get("email")
+def _is_placeholder(email: Optional[str]) -> bool:
+    return not email or email.endswith(PLACEHOLDER_EMAIL_DOMAIN)
 
-    if not clerk_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: missing user ID",
-        )
 
-    # If we still don't have email, use a placeholder derived from clerk_id
-    if not email:
-        logger.warning(f"Could not resolve email for clerk_id={clerk_id}, using placeholder")
-        email = f"{clerk_id}@clerk.placeholder"
+def _profile_changes(current: Any, clerk_user: dict) -> Dict[str, str]:
+    """Fields whose Clerk value differs from what is stored. Empty means no write."""
+    changes = {}
+    email = clerk_user.get("email")
+    if not _is_placeholder(email) and current.email != email:
+        changes["email"] = email
+    for field, claim in (("first_name", "given_name"), ("last_name", "family_name")):
+        value = clerk_user.get(claim)
+        if value and getattr(current, field) != value:
+            changes[field] = value
+    return changes
+
 
-    # Get or create user in database
+def _sync_user(db: Session, clerk_id: str, clerk_user: dict) -> CurrentUser:
+    """
+    Get or create the users row, writing only fields that really changed.
+    Runs in the threadpool in sync mode, so it must not touch the identity
+    cache; the caller stores the returned snapshot on the event loop.
+    """
     user = db.query(User).filter(User.clerk_id == clerk_id).first()
 
     if not user:
+        email = clerk_user.get("email")
+        # If we still don't have email, use a placeholder derived from clerk_id
+        if not email:
+            logger.warning(f"Could not resolve email for clerk_id={clerk_id}, using placeholder")
+            email = f"{clerk_id}{PLACEHOLDER_EMAIL_DOMAIN}"
         user = User(
             clerk_id=clerk_id,
             email=email,
@@ -111,14 +150,42 @@ def get_current_user(
         db.refresh(user)
         logger.info(f"Created new user: clerk_id={clerk_id}, email={email}")
     else:
-        # Update email if we now have a real one and the stored one is a placeholder
-        if email and not email.endswith("@clerk.placeholder") and user.email != email:
-            user.email = email
-            if clerk_user.get("given_name"):
-                user.first_name = clerk_user.get("given_name")
-            if clerk_user.get("family_name"):
-                user.last_name = clerk_user.get("family_name")
+        changes = _profile_changes(user, clerk_user)
+        if changes:
+            for field, value in changes.items():
+                setattr(user, field, value)
             db.commit()
             db.refresh(user)
+            logger.info(f"Updated user clerk_id={clerk_id}: {sorted(changes)}")
+
+    return CurrentUser.from_row(user)
+
+
+async def get_current_user(
+    clerk_user: dict = Depends(get_clerk_user),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """
+    Get or create user in database based on Clerk authentication.
+
+    Returns a CurrentUser snapshot. On a warm identity cache with nothing to
+    update this does not touch the database at all.
+    """
+    clerk_id = clerk_user.get("sub")
+
+    if not clerk_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token: missing user ID",
+        )
+
+    cached = get_cached_identity(clerk_id)
+    if cached is not None and not _profile_changes(cached, clerk_user):
+        return cached
+
+    return remember_identity(await run_db(db, _sync_user, clerk_id, clerk_user))
+
 
-    return user
\ No newline at end of file
+async def get_current_user_id(current_user: CurrentUser = Depends(get_current_user)) -> int:
+    """For routes that only need the caller's users.id."""
+    return current_user.id
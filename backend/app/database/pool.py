@@ -0,0 +1,71 @@
+"""
+Connection pool classes that record checkout latency, timeouts and peak
+usage, so the pool can be sized against the worker count.
+"""
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    __slots__ = ("checkouts", "wait_total", "wait_max", "timeouts", "peak_in_use")
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.peak_in_use = 0
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def connect(self):
+        if not hasattr(self, "metrics"):
+            self.metrics = PoolMetrics()
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        wait = time.perf_counter() - start
+        m = self.metrics
+        m.checkouts += 1
+        m.wait_total += wait
+        m.wait_max = max(m.wait_max, wait)
+        m.peak_in_use = max(m.peak_in_use, self.checkedout())
+        return conn
+
+    def stats(self) -> Dict[str, Any]:
+        m = getattr(self, "metrics", None) or PoolMetrics()
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": self.overflow(),
+            "peak_in_use": m.peak_in_use,
+            "checkouts": m.checkouts,
+            "checkout_wait_avg_ms": round(m.wait_total / m.checkouts * 1000, 3) if m.checkouts else 0.0,
+            "checkout_wait_max_ms": round(m.wait_max * 1000, 3),
+            "timeouts": m.timeouts,
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        return pool.stats()
+    return {"status": pool.status()}
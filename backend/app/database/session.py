@@ -1,15 +1,32 @@
+from typing import Any, Callable, TypeVar, Union
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from ..core.config import settings
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+T = TypeVar("T")
 
 DATABASE_URL = settings.DATABASE_URL
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Pool sizing comes from settings. Keep
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the server's max_connections.
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,   # important for PostgreSQL
-    future=True
+    poolclass=InstrumentedQueuePool,
+    future=True,
+    **POOL_OPTIONS,
 )
 
 SessionLocal = sessionmaker(
@@ -17,3 +34,47 @@ SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False
 )
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync SQLAlchemy URL onto its asyncio driver."""
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+# Async engine/sessions (asyncpg / aiosqlite), used when DB_ASYNC is enabled.
+# The sync engine above is still used by migrations and scripts.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        _async_database_url(DATABASE_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        **POOL_OPTIONS,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def run_db(db: Union[Session, Any], fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run `fn(session, *args)` against either kind of session.
+
+    Query code is written once against the sync Session API. With an
+    AsyncSession it runs on the event loop through `run_sync`; with a plain
+    Session it is sent to the threadpool, as FastAPI does for `def` routes.
+    """
+    if AsyncSessionLocal is not None and not isinstance(db, Session):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
@@ -1,4 +1,6 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -8,14 +10,19 @@ logger = logging.getLogger(__name__)
 
 try:
     from backend.app.routers import auth
-    from backend.app.database.base import Base
-    from backend.app.database.session import engine
+    from backend.app.database.session import async_engine
     from backend.app.database.deps import get_current_user
     from backend.app.models.user import User
     from backend.app.models.meeting import Meeting 
     from backend.app.routers import meeting
     from backend.app.routers import websocket
+    from backend.app.routers import internal
     from backend.app.core.config import settings
+    from backend.app.core.security import start_jwks_refresher, stop_jwks_refresher
+    from backend.app.core.http_client import init_http_client, close_http_client
+    from backend.app.core.drain import install_sigterm_drain
+    from backend.app.core.websocket_manager import manager
+    from backend.app.migrate import check_schema_revision
     
     logger.info("✓ All imports successful")
     logger.info(f"Database URL configured: {bool(settings.DATABASE_URL)}")
@@ -24,37 +31,36 @@ except Exception as e:
     logger.error(f"✗ Import error: {e}")
     raise
 
-from alembic.config import Config
-from alembic import command
-import os
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrations run once per deploy via `python -m backend.app.migrate`;
+    # workers only verify the schema revision
+    if settings.DB_SCHEMA_CHECK != "off":
+        try:
+            current = await run_in_threadpool(check_schema_revision)
+        except Exception as e:
+            logger.error(f"✗ Could not check database schema revision: {e}")
+            current = False
+        if not current and settings.DB_SCHEMA_CHECK == "strict":
+            raise RuntimeError("Database schema is not at the latest revision")
 
-# This command creates tables only if they don't exist
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("✓ Database tables created/verified")
-    
-    # Run Alembic migrations automatically
-    logger.info("Running database migrations...")
-    current_dir = os.path.dirname(os.path.abspath(__file__)) # this is backend/app
-    backend_dir = os.path.dirname(current_dir) # this is backend
-    
-    alembic_ini_path = os.path.join(backend_dir, "alembic.ini")
-    alembic_script_location = os.path.join(backend_dir, "alembic")
-    
-    # Optional: check if paths exist and log them to help debug in production
-    if not os.path.exists(alembic_script_location):
-        logger.warning(f"Alembic script location not found at {alembic_script_location}")
-    
-    alembic_cfg = Config(alembic_ini_path)
-    alembic_cfg.set_main_option("script_location", alembic_script_location)
-    command.upgrade(alembic_cfg, "head")
-    logger.info("✓ Database migrations completed successfully")
+    # One pooled client for every Clerk call
+    await init_http_client()
+    # Keep Clerk's signing keys warm so no request waits on a JWKS fetch
+    start_jwks_refresher()
+    # Move live call participants off this worker before it exits
+    restore_sigterm = install_sigterm_drain(manager)
+    yield
+    restore_sigterm()
+    await manager.drain(settings.WS_DRAIN_TIMEOUT, settings.WS_RECONNECT_JITTER_MS)
+    await manager.close()
+    await stop_jwks_refresher()
+    await close_http_client()
+    if async_engine is not None:
+        await async_engine.dispose()
 
-except Exception as e:
-    logger.error(f"✗ Database initialization error: {e}")
-    raise
 
-app = FastAPI(title="Zoom Clone Backend")
+app = FastAPI(title="Zoom Clone Backend", lifespan=lifespan)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -80,6 +86,7 @@ logger.info("✓ CORS middleware configured")
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(meeting.router, prefix="/meetings", tags=["Meetings"])
 app.include_router(websocket.router)
+app.include_router(internal.router, prefix="/internal", tags=["Internal"])
 
 @app.get("/")
 def root():
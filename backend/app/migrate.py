@@ -0,0 +1,78 @@
+"""
+Database migration entry point.
+
+Creates any missing tables and upgrades the schema to the latest Alembic
+revision. Run it once per deploy, before starting the workers:
+
+    python -m backend.app.migrate        # from the project root
+    python -m app.migrate                # from backend/
+
+Application startup only checks the revision (see `check_schema_revision`).
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+app_dir = os.path.dirname(os.path.abspath(__file__))  # backend/app
+backend_dir = os.path.dirname(app_dir)  # backend
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    alembic_ini_path = os.path.join(backend_dir, "alembic.ini")
+    alembic_script_location = os.path.join(backend_dir, "alembic")
+
+    # Optional: check if paths exist and log them to help debug in production
+    if not os.path.exists(alembic_script_location):
+        logger.warning(f"Alembic script location not found at {alembic_script_location}")
+
+    alembic_cfg = Config(alembic_ini_path)
+    alembic_cfg.set_main_option("script_location", alembic_script_location)
+    return alembic_cfg
+
+
+def run_migrations():
+    from alembic import command
+
+    from .database.base import Base
+    from .database.session import engine
+    from . import models  # noqa: F401  (registers all tables on Base.metadata)
+
+    # This command creates tables only if they don't exist
+    Base.metadata.create_all(bind=engine)
+    logger.info("✓ Database tables created/verified")
+
+    logger.info("Running database migrations...")
+    command.upgrade(alembic_config(), "head")
+    logger.info("✓ Database migrations completed successfully")
+
+
+def check_schema_revision() -> bool:
+    """
+    Compare the database's Alembic revision with the newest migration script.
+    Returns True when the schema is current. Does not modify the database.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    from .database.session import engine
+
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current == heads:
+        logger.info(f"✓ Database schema is at revision {', '.join(sorted(heads))}")
+        return True
+    logger.warning(
+        f"Database schema revision {sorted(current) or 'none'} does not match head {sorted(heads)}; "
+        "run `python -m backend.app.migrate`"
+    )
+    return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migrations()
@@ -1,2 +1,3 @@
 from .user import User
-from .meeting import Meeting
\ No newline at end of file
+from .meeting import Meeting
+from .meeting_id_sequence import MeetingIdSequence
\ No newline at end of file
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from datetime import datetime, timezone
 from ..database.base import Base
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    # Serves /my-meetings: host filter + created_at keyset ordering
+    __table_args__ = (Index("ix_meetings_host_id_created_at", "host_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     # The short ID for the URL (e.g., abc-def-ghi)
@@ -12,6 +14,8 @@ class Meeting(Base):
     title = Column(String, nullable=False)
     # Password for the room (auto-generated)
     password = Column(String, nullable=False) 
+    # Keyed HMAC of the password, checked on join (plaintext is still shown to the host)
+    password_hash = Column(String, nullable=True)
     # Unique token for invitation link
     invitation_token = Column(String, unique=True, index=True)
     # Link to the User who created it
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, BigInteger
+from ..database.base import Base
+
+class MeetingIdSequence(Base):
+    """
+    Single-row counter behind the meeting ID allocator. Workers reserve
+    blocks of counter values from it; see core/meeting_ids.py.
+    """
+    __tablename__ = "meeting_id_sequence"
+
+    id = Column(Integer, primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=0)
@@ -1,3 +1,4 @@
 from . import auth
 from . import meeting
 from . import websocket
+from . import internal
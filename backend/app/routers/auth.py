@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 
-from ..models.user import User
+from ..core.identity import CurrentUser
 from ..database.deps import get_current_user
 from ..schemas.user import UserResponse
 
@@ -8,7 +8,7 @@ from ..schemas.user import UserResponse
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     """
     Get the current authenticated user's information from the database.
     Authentication is handled by Clerk via the get_current_user dependency.
@@ -0,0 +1,79 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from ..core.config import settings
+from ..core.identity import identity_cache_stats
+from ..core.join_verification import join_attempts, join_limiter
+from ..core.meeting_cache import meeting_cache
+from ..core.security import profile_cache_stats, token_cache_stats
+from ..core.websocket_manager import manager
+from ..database.pool import pool_stats
+from ..database.session import engine, async_engine
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """
+    Guard for operational endpoints. Deny by default: every request is
+    refused until INTERNAL_API_TOKEN is configured and sent as X-Internal-Token.
+    """
+    if not settings.INTERNAL_API_TOKEN or not hmac.compare_digest(
+        x_internal_token or "", settings.INTERNAL_API_TOKEN
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+# Prefix is handled in main.py to keep this file flexible
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/pool")
+def get_pool_metrics():
+    """
+    Connection pool usage for this worker: in-use/idle/overflow counts,
+    checkout wait times and QueuePool timeouts.
+    """
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine) if async_engine is not None else None,
+    }
+
+
+@router.get("/auth-caches")
+def get_auth_cache_metrics():
+    """Size and hit/miss counts for the verified-token, Clerk profile and identity caches."""
+    return {
+        "tokens": token_cache_stats(),
+        "profiles": profile_cache_stats(),
+        "identities": identity_cache_stats(),
+    }
+
+
+@router.get("/meeting-cache")
+def get_meeting_cache_metrics():
+    """Hit/miss counts, DB loads and coalesced lookups for the meeting cache."""
+    return meeting_cache.stats()
+
+
+@router.get("/join-limiter")
+def get_join_limiter_metrics():
+    """Join attempt outcomes and token-bucket decisions for this worker."""
+    return {**join_limiter.stats(), "attempts": dict(join_attempts)}
+
+
+@router.get("/ws")
+def get_websocket_metrics():
+    """Outbound queue depth and lag, backpressure and drain counters for this worker."""
+    return manager.stats()
+
+
+@router.post("/drain")
+async def start_drain():
+    """
+    Stop accepting /ws connections and ask live peers to reconnect elsewhere.
+    For deploy hooks that run before SIGTERM; returns without waiting. Drain
+    mode lasts until the process exits, so like every /internal route this
+    is refused unless INTERNAL_API_TOKEN is configured and sent.
+    """
+    manager.drain(settings.WS_DRAIN_TIMEOUT, settings.WS_RECONNECT_JITTER_MS)
+    return manager.stats()
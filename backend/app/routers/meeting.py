@@ -1,19 +1,35 @@
-import uuid
+import base64
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 # Internal imports
-from ..database.deps import get_db, get_current_user
+from ..database.deps import get_db, get_current_user, get_current_user_id
+from ..database.session import run_db
+from ..core.identity import CurrentUser
+from ..core.join_verification import (
+    hash_meeting_password,
+    join_attempts,
+    join_limit_key,
+    join_limiter,
+    verify_meeting_password,
+)
+from ..core.meeting_cache import meeting_cache
+from ..core.meeting_ids import meeting_ids
+from ..core.config import settings
+from ..core.tickets import issue_join_ticket, verify_join_ticket
 from ..models.meeting import Meeting
-from ..models.user import User
 from ..schemas.meeting import (
     MeetingCreate, 
     MeetingOut, 
     MeetingJoin,
     MeetingCreateResponse,
-    InvitationDetails
+    InvitationDetails,
+    TicketRenew
 )
 from ..core.utils import generate_meeting_credentials
 
@@ -21,22 +37,78 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+# Query helpers take a sync Session and run through run_db(), which uses the
+# threadpool or AsyncSession.run_sync depending on DB_ASYNC.
+def _insert_meeting(db: Session, meeting: Meeting) -> Meeting:
+    try:
+        db.add(meeting)
+        db.commit()
+        db.refresh(meeting)
+        return meeting
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _meeting_by_invitation(db: Session, invitation_token: str):
+    return db.query(Meeting).filter(Meeting.invitation_token == invitation_token).first()
+
+
+def _meeting_by_id(db: Session, meeting_id: str):
+    return db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+
+
+def _meetings_for_host(db: Session, host_id: int, limit: int, after: Optional[Tuple[datetime, int]]):
+    """
+    One page of a host's meetings, newest first. Keyset pagination on
+    (created_at, id) so every page is an index range scan, and only the
+    columns MeetingOut needs are selected.
+    """
+    query = (
+        select(Meeting.id, Meeting.meeting_id, Meeting.title, Meeting.host_id, Meeting.created_at)
+        .where(Meeting.host_id == host_id)
+        .order_by(Meeting.created_at.desc(), Meeting.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        created_at, row_id = after
+        query = query.where(or_(
+            Meeting.created_at < created_at,
+            and_(Meeting.created_at == created_at, Meeting.id < row_id),
+        ))
+    return db.execute(query).all()
+
+
+def _encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 @router.post("/create", response_model=MeetingCreateResponse)
-def create_meeting(
+async def create_meeting(
     meeting_in: MeetingCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Creates a new meeting with:
     - Auto-generated 6-digit numeric password
     - Unique invitation token for shareable link
-    - 9-digit meeting ID (format: xxx-xxx-xxx)
+    - 9-hex-digit meeting ID (format: xxx-xxx-xxx), unique by construction
     """
     try:
-        # Generate unique ID (format: xxx-xxx-xxx)
-        raw_uuid = str(uuid.uuid4()).replace("-", "")
-        short_id = f"{raw_uuid[:3]}-{raw_uuid[3:6]}-{raw_uuid[6:9]}"
+        # Unique ID from this worker's reserved block (format: xxx-xxx-xxx)
+        short_id = await meeting_ids.allocate(db)
 
         # Generate password and invitation token
         password, invitation_token = generate_meeting_credentials()
@@ -48,12 +120,11 @@ def create_meeting(
             title=meeting_in.title,
             host_id=current_user.id,
             password=password,
+            password_hash=hash_meeting_password(password),
             invitation_token=invitation_token
         )
         
-        db.add(new_meeting)
-        db.commit()
-        db.refresh(new_meeting)
+        new_meeting = await run_db(db, _insert_meeting, new_meeting)
         
         logger.info(f"Meeting created successfully: {new_meeting.meeting_id}")
         
@@ -66,25 +137,25 @@ def create_meeting(
         }
     except Exception as e:
         logger.error(f"Error creating meeting: {str(e)}", exc_info=True)
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create meeting: {str(e)}"
         )
 
 @router.get("/invitation/{invitation_token}", response_model=InvitationDetails)
-def get_invitation_details(
+async def get_invitation_details(
     invitation_token: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Retrieve meeting details using the invitation token.
     This is used when sharing the invitation link.
     """
-    meeting = db.query(Meeting).filter(
-        Meeting.invitation_token == invitation_token
-    ).first()
+    meeting = await meeting_cache.get(
+        "invitation_token", invitation_token,
+        lambda: run_db(db, _meeting_by_invitation, invitation_token),
+    )
     
     if not meeting:
         raise HTTPException(
@@ -101,47 +172,119 @@ def get_invitation_details(
     return meeting
 
 @router.post("/join")
-def join_meeting(
+async def join_meeting(
     join_data: MeetingJoin,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Verify meeting ID and password before allowing join.
+    Attempts are rate limited per (meeting, user) before any lookup.
     """
+    allowed, retry_after = await join_limiter.hit(join_limit_key(join_data.meeting_id, current_user.id))
+    if not allowed:
+        join_attempts["rate_limited"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many join attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
     # Search for the meeting by the custom ID
-    meeting = db.query(Meeting).filter(Meeting.meeting_id == join_data.meeting_id).first()
+    meeting = await meeting_cache.get(
+        "meeting_id", join_data.meeting_id,
+        lambda: run_db(db, _meeting_by_id, join_data.meeting_id),
+    )
     
     if not meeting:
+        join_attempts["not_found"] += 1
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Meeting room not found"
         )
 
-    # Verify the password
-    if join_data.password != meeting.password:
+    # Verify the password (constant time)
+    if not verify_meeting_password(meeting, join_data.password):
+        join_attempts["bad_password"] += 1
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Incorrect meeting password"
         )
 
-    # Success response
+    if not meeting.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="This meeting has ended"
+        )
+
+    join_attempts["succeeded"] += 1
+    # Success response; `ticket` authorizes the /ws/{room_id} connection
     return {
         "status": "success",
         "message": f"Successfully joined {meeting.title}",
         "data": {
             "room_id": meeting.meeting_id,
             "title": meeting.title,
-            "joined_as": current_user.email
+            "joined_as": current_user.email,
+            "ticket": issue_join_ticket(meeting.meeting_id, current_user.id)
         }
     }
 
+@router.post("/ticket")
+async def renew_ticket(
+    renew_data: TicketRenew,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Swap a join ticket for a fresh one, e.g. when the room page is reloaded
+    after the original has expired. The old ticket must be authentic, for
+    this meeting and user, and expired less than WS_TICKET_RENEW_WINDOW ago;
+    the host needs no ticket. Everyone else goes back through /join.
+    """
+    meeting = await meeting_cache.get(
+        "meeting_id", renew_data.meeting_id,
+        lambda: run_db(db, _meeting_by_id, renew_data.meeting_id),
+    )
+
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting room not found"
+        )
+
+    if not meeting.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="This meeting has ended"
+        )
+
+    if meeting.host_id != current_user.id:
+        claims = verify_join_ticket(renew_data.ticket, meeting.meeting_id, leeway=settings.WS_TICKET_RENEW_WINDOW)
+        if claims is None or claims.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Join ticket cannot be renewed, please join the meeting again"
+            )
+
+    return {"ticket": issue_join_ticket(meeting.meeting_id, current_user.id)}
+
 @router.get("/my-meetings", response_model=List[MeetingOut])
-def get_user_meetings(
+async def get_user_meetings(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    user_id: int = Depends(get_current_user_id)
 ):
     """
-    Returns a list of all meetings hosted by the current user.
+    Returns the meetings hosted by the current user, newest first.
+    When more are available the X-Next-Cursor header holds the value to
+    pass as `cursor` for the next page.
     """
-    return db.query(Meeting).filter(Meeting.host_id == current_user.id).all()
\ No newline at end of file
+    after = _decode_cursor(cursor) if cursor else None
+    rows = await run_db(db, _meetings_for_host, user_id, limit, after)
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
+    return rows
\ No newline at end of file
@@ -1,24 +1,93 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from ..core import codec
+from ..core.config import settings
+from ..core.meeting_cache import meeting_cache
+from ..core.tickets import verify_join_ticket
 from ..core.websocket_manager import manager
+from ..database.deps import get_current_user_id
+
+MAX_OCCUPANCY_ROOMS = 100
 
 router = APIRouter()
 
+@router.get("/rooms/occupancy")
+async def rooms_occupancy(
+    ids: str = Query(..., description="Comma-separated meeting IDs"),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Live participant counts for many rooms in one call, served from the
+    connection manager's state plus, with the Redis backplane, one round
+    trip for the other workers' counts (no database or socket needed).
+    """
+    room_ids = [room_id for room_id in dict.fromkeys(ids.split(",")) if room_id]
+    if len(room_ids) > MAX_OCCUPANCY_ROOMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_OCCUPANCY_ROOMS} rooms per request"
+        )
+    return {"rooms": await manager.occupancy(room_ids)}
+
 @router.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str):
-    await manager.connect(websocket, room_id)
+async def websocket_endpoint(websocket: WebSocket, room_id: str, ticket: Optional[str] = None):
+    # Refuse before accept(): needs a valid ticket from /meetings/join for
+    # this room, and the meeting must not be known to have ended
+    if manager.draining:
+        # Shutting down; clients retry against another worker
+        manager.metrics["handshakes_refused_draining"] += 1
+        await websocket.close(code=status.WS_1012_SERVICE_RESTART)
+        return
+
+    claims = verify_join_ticket(ticket, room_id)
+    if claims is None or meeting_cache.is_ended(room_id):
+        manager.metrics["handshakes_refused"] += 1
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    conn = await manager.connect(websocket, room_id, user_id=claims.user_id)
     try:
         while True:
             # Wait for messages from a participant (Offer, Answer, or ICE Candidate)
-            data = await websocket.receive_json()
-            
-            # Relay that message to everyone else in the same room
-            await manager.broadcast_to_room(data, room_id, sender=websocket)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            conn.last_seen = time.monotonic()
+            raw = message.get("text")
+            if raw is None:
+                # Signaling is text only; binary frames are ignored
+                continue
+            try:
+                data = codec.loads(raw)
+            except ValueError:
+                continue
+            if settings.WS_RELAY_MODE != "raw":
+                # json mode re-serializes; raw mode forwards the original frame as-is
+                raw = None
+            if not isinstance(data, dict):
+                continue
+            # Heartbeat reply; nothing to relay
+            if data.get("type") == "pong":
+                continue
+
+            # Remember who this socket is so targeted messages can reach it
+            if data.get("type") == "join" and data.get("senderId"):
+                if not await manager.register_peer(
+                    websocket, room_id, data["senderId"], data.get("capabilities") or ()
+                ):
+                    # Someone else's peer ID; the client rejoins with a fresh one
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    break
+
+            # Unicast to `targetId` when present, otherwise relay to the room
+            await manager.route(data, room_id, sender=websocket, raw=raw)
             
     except WebSocketDisconnect:
-        manager.disconnect(websocket, room_id)
-        # Notify others that someone left
-        await manager.broadcast_to_room(
-            {"type": "user-left", "message": "A participant has left the call"},
-            room_id,
-            sender=websocket
-        )
\ No newline at end of file
+        pass
+    finally:
+        # Every exit path removes the peer. Notify others that someone left,
+        # unless it was already evicted or reaped (those are announced when
+        # they are removed)
+        if manager.disconnect(websocket) is not None:
+            await manager.announce_departure(conn)
\ No newline at end of file
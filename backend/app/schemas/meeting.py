@@ -36,4 +36,8 @@ class InvitationDetails(BaseModel):
 
 class MeetingJoin(BaseModel):
     meeting_id: str
-    password: str        
\ No newline at end of file
+    password: str
+
+class TicketRenew(BaseModel):
+    meeting_id: str
+    ticket: Optional[str] = None
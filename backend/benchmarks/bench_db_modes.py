@@ -0,0 +1,105 @@
+"""
+Load benchmark: requests/second for the meeting routes with the sync
+(threadpool) database path versus the async engine (DB_ASYNC=true).
+
+Each mode runs in its own process against a fresh, migrated SQLite file,
+with authentication and the join rate limiter overridden so only routing +
+database work is measured.
+
+Run from the project root:
+    python -m backend.benchmarks.bench_db_modes [--concurrency 64] [--duration 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_worker(concurrency: int, duration: float):
+    import httpx
+
+    from backend.app.core.identity import CurrentUser
+    from backend.app.core.join_verification import join_limiter
+    from backend.app.core.rate_limit import BucketStorage
+    from backend.app.database.deps import get_current_user
+    from backend.app.database.session import SessionLocal
+    from backend.app.main import app
+    from backend.app.models.meeting import Meeting
+    from backend.app.models.user import User
+
+    db = SessionLocal()
+    user = User(clerk_id="bench", email="bench@example.com")
+    db.add(user)
+    db.commit()
+    for i in range(20):
+        db.add(Meeting(meeting_id=f"bch-{i:03d}-000", title=f"m{i}", password="123456",
+                       invitation_token=f"bench-{i}", host_id=user.id))
+    db.commit()
+    current = CurrentUser.from_row(user)
+    db.close()
+    app.dependency_overrides[get_current_user] = lambda: current
+
+    class Unlimited(BucketStorage):
+        async def take(self, key, capacity, rate):
+            return True, 0.0
+
+    # Every client joins the same 20 meetings over and over; without this the
+    # run would measure 429s from the join limiter
+    join_limiter.storage = Unlimited()
+
+    async def client_loop(client: httpx.AsyncClient, deadline: float, counts: dict):
+        i = 0
+        while time.perf_counter() < deadline:
+            if i % 2:
+                r = await client.get("/meetings/my-meetings")
+            else:
+                r = await client.post("/meetings/join", json={"meeting_id": f"bch-{i % 20:03d}-000", "password": "123456"})
+            counts["ok" if r.status_code == 200 else "err"] += 1
+            i += 1
+
+    async def main():
+        counts = {"ok": 0, "err": 0}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            deadline = start + duration
+            await asyncio.gather(*(client_loop(client, deadline, counts) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        print(json.dumps({"rps": counts["ok"] / elapsed, **counts}))
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.concurrency, args.duration)
+        return
+
+    print(f"concurrency={args.concurrency} duration={args.duration}s")
+    for mode in ("false", "true"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DB_ASYNC=mode, DATABASE_URL=f"sqlite:///{tmp}/bench.db")
+            # The app no longer creates tables at import; migrate like a deploy would
+            subprocess.run([sys.executable, "-m", "backend.app.migrate"], env=env, capture_output=True, check=True)
+            out = subprocess.run(
+                [sys.executable, "-m", "backend.benchmarks.bench_db_modes", "--worker",
+                 "--concurrency", str(args.concurrency), "--duration", str(args.duration)],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            label = "async engine" if mode == "true" else "sync + threadpool"
+            print(f"  {label:<18} {result['rps']:8.1f} req/s  (errors: {result['err']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark for meeting ID allocation.
+
+1. Raw allocator throughput: Feistel permutation + formatting, and
+   allocation from DB-reserved blocks, with a uniqueness check.
+2. Sustained POST /meetings/create rate against a fresh SQLite file, with
+   authentication overridden so only ID allocation + the INSERT are measured.
+
+Run from the project root:
+    python -m backend.benchmarks.bench_meeting_ids [--count 200000] [--concurrency 32] [--duration 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+def bench_allocator(count: int):
+    from backend.app.core.meeting_ids import FeistelPermutation, MeetingIdAllocator, format_meeting_id
+    from backend.app.database.session import SessionLocal
+
+    perm = FeistelPermutation(b"bench-key")
+    start = time.perf_counter()
+    ids = {format_meeting_id(perm.permute(i)) for i in range(count)}
+    elapsed = time.perf_counter() - start
+    assert len(ids) == count, "permutation produced a duplicate"
+    print(f"  permute+format     {count / elapsed:12.0f} ids/s")
+
+    async def allocate_all():
+        allocator = MeetingIdAllocator(perm, block_size=256)
+        db = SessionLocal()
+        try:
+            return [await allocator.allocate(db) for _ in range(count)], allocator.blocks_reserved
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    allocated, blocks = asyncio.run(allocate_all())
+    elapsed = time.perf_counter() - start
+    assert len(set(allocated)) == count, "allocator produced a duplicate"
+    print(f"  allocate (blocks)  {count / elapsed:12.0f} ids/s  ({blocks} DB reservations)")
+
+
+def bench_create(concurrency: int, duration: float):
+    import httpx
+
+    from backend.app.core.identity import CurrentUser
+    from backend.app.database.deps import get_current_user
+    from backend.app.database.session import SessionLocal
+    from backend.app.main import app
+    from backend.app.models.user import User
+
+    db = SessionLocal()
+    user = User(clerk_id="bench-ids", email="bench-ids@example.com")
+    db.add(user)
+    db.commit()
+    current = CurrentUser.from_row(user)
+    db.close()
+    app.dependency_overrides[get_current_user] = lambda: current
+
+    async def client_loop(client: httpx.AsyncClient, deadline: float, counts: dict):
+        while time.perf_counter() < deadline:
+            r = await client.post("/meetings/create", json={"title": "bench"})
+            counts["ok" if r.status_code == 200 else "err"] += 1
+
+    async def main():
+        counts = {"ok": 0, "err": 0}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            deadline = start + duration
+            await asyncio.gather(*(client_loop(client, deadline, counts) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        print(f"  /meetings/create   {counts['ok'] / elapsed:12.1f} req/s  (errors: {counts['err']})")
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        from backend.app.migrate import run_migrations
+
+        run_migrations()
+        print(f"count={args.count} concurrency={args.concurrency} duration={args.duration}s")
+        bench_allocator(args.count)
+        bench_create(args.concurrency, args.duration)
+
+
+if __name__ == "__main__":
+    main()
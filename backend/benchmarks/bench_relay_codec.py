@@ -0,0 +1,55 @@
+"""
+Microbenchmark: cost of relaying one signaling frame to N recipients.
+
+  json mode - receive_json() parse, then json.dumps() per recipient (the old path)
+  raw mode  - parse once with the relay codec, forward the original text
+
+Run from the project root:
+    python -m backend.benchmarks.bench_relay_codec [recipients]
+"""
+import json
+import sys
+import timeit
+
+from backend.app.core import codec
+
+SDP = "v=0\r\no=- 4611731400430051336 2 IN IP4 127.0.0.1\r\n" + "a=candidate:1 1 udp 2122260223 192.168.1.2 54321 typ host\r\n" * 60
+OFFER = json.dumps({
+    "type": "offer",
+    "senderId": "k3j9x1",
+    "targetId": "p0q8z2",
+    "sdp": {"type": "offer", "sdp": SDP},
+})
+ICE = json.dumps({
+    "type": "ice-candidate",
+    "senderId": "k3j9x1",
+    "targetId": "p0q8z2",
+    "candidate": {"candidate": "candidate:1 1 udp 2122260223 192.168.1.2 54321 typ host", "sdpMid": "0", "sdpMLineIndex": 0},
+})
+
+
+def json_mode(frame: str, recipients: int):
+    data = json.loads(frame)
+    data.get("type"), data.get("targetId")
+    return [json.dumps(data) for _ in range(recipients)]
+
+
+def raw_mode(frame: str, recipients: int):
+    data = codec.loads(frame)
+    data.get("type"), data.get("targetId")
+    return [frame] * recipients
+
+
+def main():
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    number = 20000
+    print(f"codec backend: {codec.BACKEND}, recipients per frame: {recipients}")
+    for name, frame in (("offer", OFFER), ("ice-candidate", ICE)):
+        print(f"\n{name} ({len(frame)} bytes)")
+        for mode in (json_mode, raw_mode):
+            seconds = min(timeit.repeat(lambda: mode(frame, recipients), number=number, repeat=5))
+            print(f"  {mode.__name__:<10} {seconds / number * 1e6:8.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
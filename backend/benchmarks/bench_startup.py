@@ -0,0 +1,70 @@
+"""
+Startup benchmark: import-to-ready latency of the API process.
+
+  legacy  - import + create_all + `alembic upgrade head` (what main.py used
+            to do at import time) + lifespan startup
+  current - import + lifespan startup (schema revision check only)
+
+Both run against an already-migrated SQLite database, i.e. an ordinary
+restart or an extra worker coming up. Each sample is a fresh interpreter.
+
+Run from the project root:
+    python -m backend.benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_worker(legacy: bool):
+    start = time.perf_counter()
+    from backend.app.main import app
+    if legacy:
+        from backend.app.migrate import run_migrations
+        run_migrations()
+    imported = time.perf_counter()
+
+    async def startup():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+
+    ready = asyncio.run(startup())
+    print(json.dumps({"import": imported - start, "ready": ready - start}))
+
+
+def sample(mode: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.bench_startup", "--worker", mode],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--worker", choices=("legacy", "current"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker == "legacy")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/startup.db", CLERK_PUBLISHABLE_KEY="")
+        subprocess.run([sys.executable, "-m", "backend.app.migrate"], env=env, capture_output=True, check=True)
+        print(f"import-to-ready over {args.runs} runs (median)")
+        for mode in ("legacy", "current"):
+            runs = [sample(mode, env) for _ in range(args.runs)]
+            ready = statistics.median(r["ready"] for r in runs) * 1000
+            print(f"  {mode:<8} {ready:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Import-time profile and budget check for the API module.
+
+Runs `python -X importtime -c "import backend.app.main"` in fresh
+interpreters and reports the slowest modules and top-level packages.
+
+Run from the project root:
+    python -m backend.benchmarks.importtime                # report
+    python -m backend.benchmarks.importtime --check        # CI: exit 1 if over budget
+
+The budget is --budget-ms or IMPORT_TIME_BUDGET_MS (default 1500 ms) and is
+compared against the median cumulative import time of backend.app.main.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+TARGET = "backend.app.main"
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def profile(target: str = TARGET) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for one cold import of `target`."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"importing {target} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def total_ms(rows: List[Tuple[str, int, int]], target: str = TARGET) -> float:
+    for name, _, cumulative in rows:
+        if name == target:
+            return cumulative / 1000
+    raise SystemExit(f"{target} not found in -X importtime output")
+
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, float]:
+    packages: Dict[str, float] = defaultdict(float)
+    for name, self_us, _ in rows:
+        top = name.split(".")[0]
+        if top == "backend":
+            top = ".".join(name.split(".")[:3])
+        packages[top] += self_us / 1000
+    return packages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="exit non-zero when over budget")
+    parser.add_argument(
+        "--budget-ms", type=float,
+        default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)),
+    )
+    args = parser.parse_args()
+
+    samples = [profile() for _ in range(args.runs)]
+    totals = [total_ms(rows) for rows in samples]
+    # median_low is always one of the samples, even for an even --runs
+    median = statistics.median_low(totals)
+    rows = samples[totals.index(median)]
+
+    if not args.check:
+        print("Slowest modules (self time, run with median total):")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+        print("\nBy package (self time):")
+        for package, ms in sorted(by_package(rows).items(), key=lambda p: p[1], reverse=True)[:args.top]:
+            print(f"  {ms:8.1f} ms  {package}")
+        print()
+
+    status = "OK" if median <= args.budget_ms else "OVER BUDGET"
+    print(f"{TARGET}: median {median:.1f} ms over {args.runs} run(s), budget {args.budget_ms:.0f} ms -> {status}")
+    if args.check and median > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+One signaling "worker" for the multi-process backplane test: a
+ConnectionManager on a RedisBackplane with a single fake peer in ROOM.
+
+    python backplane_worker.py <redis url> <peer id>
+
+Reads commands from stdin ("broadcast <text>", "send <peer> <text>",
+"occupancy") and prints "ready" once subscribed and its presence published,
+then "recv <text>" for every delivered frame.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.app.core.backplane import RedisBackplane  # noqa: E402
+from backend.app.core.websocket_manager import ConnectionManager  # noqa: E402
+
+ROOM = "room-1"
+
+
+class FakeWebSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        print(f"recv {text}", flush=True)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def main(url: str, peer_id: str):
+    manager = ConnectionManager(backplane=RedisBackplane(url), ping_interval=0)
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, ROOM)
+    await manager.register_peer(websocket, ROOM, peer_id)
+    # Make this worker's presence visible before the test starts the next one
+    if manager._presence_task is not None:
+        await manager._presence_task
+    print("ready", flush=True)
+
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        command, _, rest = line.strip().partition(" ")
+        if command == "broadcast":
+            await manager.broadcast_to_room({"type": "chat", "text": rest}, ROOM, sender=websocket)
+        elif command == "occupancy":
+            print(f"occupancy {(await manager.occupancy([ROOM]))[ROOM]}", flush=True)
+        elif command == "send":
+            target, _, text = rest.partition(" ")
+            await manager.send_to_peer({"type": "chat", "text": text, "targetId": target}, ROOM, target)
+        print("done", flush=True)
+    await manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], sys.argv[2]))
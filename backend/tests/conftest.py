@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Settings are read at import time, so configure them before the app loads
+_tmp = tempfile.mkdtemp(prefix="zoom-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("DB_SCHEMA_CHECK", "off")
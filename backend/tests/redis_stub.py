@@ -0,0 +1,135 @@
+"""
+Minimal in-process stand-in for a Redis server: just enough of pub/sub
+(SUBSCRIBE / UNSUBSCRIBE / PUBLISH / PING) and of strings and hashes (SET /
+MGET / DEL / HSET / HDEL / HGETALL; expiry is ignored) for RedisBackplane to
+run against a real socket in tests. redis-py negotiates RESP3 with HELLO, so
+nulls and maps use the RESP3 encodings.
+"""
+import asyncio
+import threading
+from typing import Dict, List, Optional, Set
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"_\r\n"
+    if isinstance(value, dict):
+        return b"%%%d\r\n" % len(value) + b"".join(_encode(k) + _encode(v) for k, v in value.items())
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()
+    parts = []
+    for _ in range(int(line[1:])):
+        size = int((await reader.readline())[1:])
+        parts.append((await reader.readexactly(size + 2))[:-2])
+    return parts
+
+
+class RedisPubSubStub:
+    def __init__(self):
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self.strings: Dict[bytes, bytes] = {}
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.published = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: Set[bytes] = set()
+        try:
+            while True:
+                command = await _read_command(reader)
+                if command is None:
+                    break
+                name, args = command[0].upper(), command[1:]
+                if name == b"SUBSCRIBE":
+                    for channel in args:
+                        subscribed.add(channel)
+                        self.channels.setdefault(channel, set()).add(writer)
+                        writer.write(_encode([b"subscribe", channel, len(subscribed)]))
+                elif name == b"UNSUBSCRIBE":
+                    for channel in args or list(subscribed):
+                        subscribed.discard(channel)
+                        self.channels.get(channel, set()).discard(writer)
+                        writer.write(_encode([b"unsubscribe", channel, len(subscribed)]))
+                elif name == b"PUBLISH":
+                    channel, message = args
+                    receivers = list(self.channels.get(channel, ()))
+                    for receiver in receivers:
+                        receiver.write(_encode([b"message", channel, message]))
+                    self.published += 1
+                    writer.write(_encode(len(receivers)))
+                elif name == b"SET":
+                    self.strings[args[0]] = args[1]
+                    writer.write(b"+OK\r\n")
+                elif name == b"MGET":
+                    writer.write(_encode([self.strings.get(key) for key in args]))
+                elif name == b"DEL":
+                    removed = sum(self.strings.pop(key, None) is not None or self.hashes.pop(key, None) is not None for key in args)
+                    writer.write(_encode(removed))
+                elif name == b"HSET":
+                    fields = self.hashes.setdefault(args[0], {})
+                    pairs = list(zip(args[1::2], args[2::2]))
+                    added = sum(field not in fields for field, _ in pairs)
+                    fields.update(pairs)
+                    writer.write(_encode(added))
+                elif name == b"HDEL":
+                    fields = self.hashes.get(args[0], {})
+                    writer.write(_encode(sum(fields.pop(field, None) is not None for field in args[1:])))
+                elif name == b"HGETALL":
+                    fields = self.hashes.get(args[0], {})
+                    writer.write(_encode(fields))
+                elif name == b"EXPIRE":
+                    writer.write(_encode(1))
+                elif name == b"PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    # CLIENT SETINFO, SELECT, ... are accepted and ignored
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    def start(self) -> "RedisPubSubStub":
+        """Serve from a background thread so the broker outlives any one event loop."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
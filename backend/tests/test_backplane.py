@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from redis_stub import RedisPubSubStub
+from backend.app.core.backplane import RedisBackplane
+
+WORKER = os.path.join(os.path.dirname(__file__), "backplane_worker.py")
+
+
+@pytest.fixture
+def broker():
+    stub = RedisPubSubStub().start()
+    yield stub
+    stub.stop()
+
+
+class Worker:
+    """A backplane_worker.py subprocess with line-based I/O."""
+
+    def __init__(self, url: str, peer_id: str):
+        env = dict(os.environ, WS_BACKPLANE="redis", REDIS_URL=url)
+        self.proc = subprocess.Popen(
+            [sys.executable, WORKER, url, peer_id],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, env=env,
+        )
+        self.lines: "queue.Queue[str]" = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        for line in self.proc.stdout:
+            self.lines.put(line.strip())
+
+    def expect(self, prefix: str, timeout: float = 10.0) -> str:
+        while True:
+            line = self.lines.get(timeout=timeout)
+            if line.startswith(prefix):
+                return line
+
+    def command(self, text: str):
+        self.proc.stdin.write(text + "\n")
+        self.proc.stdin.flush()
+        self.expect("done")
+
+    def recv(self, kind: str) -> dict:
+        """Next delivered frame of type `kind`, skipping any others."""
+        while True:
+            frame = json.loads(self.expect("recv ")[len("recv "):])
+            if frame["type"] == kind:
+                return frame
+
+    def recv_chat(self) -> dict:
+        return self.recv("chat")
+
+    def occupancy(self) -> int:
+        self.proc.stdin.write("occupancy\n")
+        self.proc.stdin.flush()
+        count = int(self.expect("occupancy ").split()[1])
+        self.expect("done")
+        return count
+
+    def stop(self):
+        self.proc.stdin.close()
+        self.proc.wait(timeout=10)
+
+
+def test_frames_cross_worker_processes(broker):
+    a = Worker(broker.url, "a")
+    b = Worker(broker.url, "b")
+    try:
+        a.expect("ready")
+        b.expect("ready")
+
+        a.command("broadcast hello")
+        assert b.recv_chat() == {"type": "chat", "text": "hello"}
+
+        # "a" only exists on the first worker, so this has to go over the broker
+        b.command("send a hi")
+        frame = a.recv_chat()
+        assert frame["text"] == "hi" and frame["targetId"] == "a"
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_presence_spans_worker_processes(broker):
+    a = Worker(broker.url, "a")
+    try:
+        a.expect("ready")
+        b = Worker(broker.url, "b")
+        try:
+            b.expect("ready")
+            # "a" lives on the other worker but is in b's roster and both counts
+            assert [peer["peerId"] for peer in b.recv("roster")["peers"]] == ["a"]
+            assert a.occupancy() == 2
+            assert b.occupancy() == 2
+        finally:
+            b.stop()
+        # A worker that shuts down withdraws its presence
+        assert a.occupancy() == 1
+    finally:
+        a.stop()
+
+
+def test_subscribe_restarts_a_finished_listener(broker):
+    async def scenario():
+        received = []
+
+        async def handler(envelope):
+            received.append(envelope["room"])
+
+        listener, publisher = RedisBackplane(broker.url), RedisBackplane(broker.url)
+        await listener.start(handler)
+        await publisher.start(handler)
+        try:
+            # A listener that stopped reading but whose reference is still set
+            finished = asyncio.create_task(asyncio.sleep(0))
+            await finished
+            listener._listener = finished
+
+            await listener.subscribe("two")
+            await asyncio.sleep(0.05)
+            await publisher.publish(publisher.envelope("two", "{}", "chat"))
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await listener.close()
+            await publisher.close()
+        return received
+
+    assert asyncio.run(scenario()) == ["two"]
@@ -0,0 +1,122 @@
+"""
+JWKS caching against a stub Clerk: stale-while-revalidate and behaviour
+while Clerk is unreachable. The stub is an httpx.MockTransport handed to the
+shared client through init_http_client(transport=...).
+"""
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from backend.app.core import security
+from backend.app.core.config import settings
+from backend.app.core.http_client import close_http_client, init_http_client
+
+CLERK_DOMAIN = "clerk.example.test"
+
+
+class StubClerk:
+    """Serves one RSA key at /.well-known/jwks.json; can be taken down."""
+
+    def __init__(self):
+        self.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.key.public_key()))
+        self.jwk["kid"] = "kid-1"
+        self.up = True
+        self.jwks_requests = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.host == CLERK_DOMAIN
+        self.jwks_requests += 1
+        if not self.up:
+            raise httpx.ConnectError("Clerk unreachable", request=request)
+        return httpx.Response(200, json={"keys": [self.jwk]})
+
+    def token(self, sub: str) -> str:
+        claims = {"sub": sub, "exp": int(time.time()) + 600}
+        return jwt.encode(claims, self.key, algorithm="RS256", headers={"kid": "kid-1"})
+
+
+@pytest.fixture
+def clerk(monkeypatch):
+    domain = base64.b64encode(f"{CLERK_DOMAIN}$".encode()).decode().rstrip("=")
+    monkeypatch.setattr(settings, "CLERK_PUBLISHABLE_KEY", f"pk_test_{domain}")
+    monkeypatch.setattr(security, "_jwks_cache", {"keys": {}, "fetched_at": 0})
+    monkeypatch.setattr(security, "_jwks_lock", asyncio.Lock())
+    monkeypatch.setattr(security, "_jwks_refresh_task", None)
+    security._token_cache.clear()
+    yield StubClerk()
+    security._token_cache.clear()
+
+
+def run(clerk: StubClerk, scenario):
+    async def main():
+        await init_http_client(transport=httpx.MockTransport(clerk.handler))
+        try:
+            return await scenario()
+        finally:
+            await close_http_client()
+
+    return asyncio.run(main())
+
+
+def expire_jwks_cache():
+    security._jwks_cache["fetched_at"] = time.time() - security._JWKS_CACHE_TTL - 1
+
+
+def test_cold_start_fetches_once(clerk):
+    async def scenario():
+        results = await asyncio.gather(*(security.verify_clerk_token(clerk.token(f"user_{i}")) for i in range(5)))
+        return [claims["sub"] for claims in results]
+
+    assert run(clerk, scenario) == [f"user_{i}" for i in range(5)]
+    assert clerk.jwks_requests == 1
+
+
+def test_stale_keys_served_without_waiting_and_revalidated(clerk):
+    async def scenario():
+        assert await security.verify_clerk_token(clerk.token("user_a"))
+        expire_jwks_cache()
+        stale_at = security._jwks_cache["fetched_at"]
+
+        claims = await security.verify_clerk_token(clerk.token("user_b"))
+        # Answered from the stale keys; the refresh runs in the background
+        assert claims["sub"] == "user_b"
+        await security._jwks_refresh_task
+        return stale_at
+
+    stale_at = run(clerk, scenario)
+    assert clerk.jwks_requests == 2
+    assert security._jwks_cache["fetched_at"] > stale_at
+
+
+def test_clerk_unreachable_keeps_serving_last_known_keys(clerk):
+    async def scenario():
+        assert await security.verify_clerk_token(clerk.token("user_a"))
+        expire_jwks_cache()
+        clerk.up = False
+
+        claims = await security.verify_clerk_token(clerk.token("user_b"))
+        assert claims["sub"] == "user_b"
+        # The failed background refresh keeps the last good keys
+        assert await security._jwks_refresh_task is False
+        assert "kid-1" in security._jwks_cache["keys"]
+        return await security.verify_clerk_token(clerk.token("user_c"))
+
+    claims = run(clerk, scenario)
+    assert claims["sub"] == "user_c"
+
+
+def test_clerk_unreachable_on_cold_start_rejects_token(clerk):
+    clerk.up = False
+
+    async def scenario():
+        return await security.verify_clerk_token(clerk.token("user_a"))
+
+    assert run(clerk, scenario) is None
+    assert security._jwks_cache["keys"] == {}
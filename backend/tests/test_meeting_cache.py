@@ -0,0 +1,31 @@
+"""
+Meeting cache invalidation from threadpool sessions: the TTLCaches are
+event-loop only, so off-loop invalidations must run on the loop.
+"""
+import asyncio
+import threading
+
+from backend.app.core.meeting_cache import CachedMeeting, MeetingCache
+
+
+def test_invalidate_from_a_thread_runs_on_the_loop():
+    cache = MeetingCache(max_size=10, ttl=60, ended_ttl=60)
+    row = CachedMeeting(meeting_id="abc-def-ghi", invitation_token="invite", is_active=True)
+
+    async def load():
+        return row
+
+    applied_on = []
+    invalidate = cache._invalidate
+    cache._invalidate = lambda *args: (applied_on.append(threading.get_ident()), invalidate(*args))
+
+    async def main():
+        assert (await cache.get("meeting_id", "abc-def-ghi", load)).meeting_id == "abc-def-ghi"
+        await asyncio.to_thread(cache.invalidate, "abc-def-ghi", "invite", True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert applied_on == [threading.get_ident()]
+    assert cache._get_local("meeting_id", "abc-def-ghi") is None
+    assert cache._get_local("invitation_token", "invite") is None
+    assert cache.is_ended("abc-def-ghi")
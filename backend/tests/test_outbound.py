@@ -0,0 +1,79 @@
+"""
+Backpressure only penalizes peers that actually fall behind: a burst larger
+than the queue must not evict a peer whose writer keeps up.
+"""
+import asyncio
+
+from backend.app.core.backplane import InMemoryBackplane
+from backend.app.core.outbound import DISCONNECT
+from backend.app.core.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def make_manager():
+    return ConnectionManager(
+        send_timeout=5.0,
+        queue_size=4,
+        max_queue_lag=0.2,
+        backpressure_policy=DISCONNECT,
+        backplane=InMemoryBackplane(),
+        ping_interval=0,
+    )
+
+
+async def burst(m, sender, count):
+    for i in range(count):
+        await m.broadcast_to_room({"type": "chat", "i": i}, "room", sender)
+
+
+def test_burst_does_not_evict_a_peer_that_keeps_up():
+    async def main():
+        m = make_manager()
+        sender, fast = FakeWebSocket(), FakeWebSocket()
+        for ws in (sender, fast):
+            await m.connect(ws, "room")
+        await burst(m, sender, 12)
+        await asyncio.sleep(0.05)
+        await m.close()
+        return m, fast
+
+    m, fast = asyncio.run(main())
+    assert len(fast.sent) == 12
+    assert m.metrics["overflow_evictions"] == 0
+
+
+def test_slow_peer_is_evicted_once_it_lags():
+    async def main():
+        m = make_manager()
+        sender, fast, slow = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(delay=0.5)
+        for ws in (sender, fast, slow):
+            await m.connect(ws, "room")
+        await burst(m, sender, 6)
+        # The slow peer's oldest frame is now older than max_queue_lag
+        await asyncio.sleep(0.3)
+        await burst(m, sender, 1)
+        connected = {conn.websocket for conn in m.active_connections["room"]}
+        await asyncio.sleep(0.05)
+        await m.close()
+        return m, fast, slow, connected
+
+    m, fast, slow, connected = asyncio.run(main())
+    assert slow not in connected and fast in connected
+    # Plus the notice that the slow peer left
+    assert sum('"chat"' in text for text in fast.sent) == 7
+    assert m.metrics["overflow_evictions"] == 1
@@ -0,0 +1,69 @@
+"""
+Join ticket renewal at POST /meetings/ticket: an expired ticket is swapped
+for a fresh one inside WS_TICKET_RENEW_WINDOW, anything else is refused.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.identity import CurrentUser
+from backend.app.core.meeting_cache import meeting_cache
+from backend.app.core.tickets import issue_join_ticket, verify_join_ticket
+from backend.app.database.base import Base
+from backend.app.database.deps import get_current_user
+from backend.app.database.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.meeting import Meeting
+
+HOST_ID = 1
+GUEST_ID = 2
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add(Meeting(meeting_id="abc-def-ghi", title="Standup", password="pw", invitation_token="invite", host_id=HOST_ID))
+    db.commit()
+    user = {"current": CurrentUser(GUEST_ID, "user_guest", "guest@example.test")}
+    app.dependency_overrides[get_current_user] = lambda: user["current"]
+    try:
+        yield TestClient(app), user, db
+    finally:
+        app.dependency_overrides.clear()
+        db.query(Meeting).delete()
+        db.commit()
+        db.close()
+        meeting_cache.invalidate("abc-def-ghi", "invite")
+
+
+def renew(test_client, ticket, meeting_id="abc-def-ghi"):
+    return test_client.post("/meetings/ticket", json={"meeting_id": meeting_id, "ticket": ticket})
+
+
+def test_expired_ticket_is_renewed(client):
+    test_client, _, _ = client
+    expired = issue_join_ticket("abc-def-ghi", GUEST_ID, ttl=-60)
+    assert verify_join_ticket(expired, "abc-def-ghi") is None
+
+    resp = renew(test_client, expired)
+    assert resp.status_code == 200
+    claims = verify_join_ticket(resp.json()["ticket"], "abc-def-ghi")
+    assert claims is not None and claims.user_id == GUEST_ID
+
+
+def test_renewal_refused(client):
+    test_client, user, db = client
+    # Too old, another user's, another room's, or no ticket at all
+    assert renew(test_client, issue_join_ticket("abc-def-ghi", GUEST_ID, ttl=-10 ** 6)).status_code == 403
+    assert renew(test_client, issue_join_ticket("abc-def-ghi", 99)).status_code == 403
+    assert renew(test_client, issue_join_ticket("zzz-zzz-zzz", GUEST_ID)).status_code == 403
+    assert renew(test_client, None).status_code == 403
+    assert renew(test_client, None, meeting_id="nope").status_code == 404
+
+    # The host needs no ticket
+    user["current"] = CurrentUser(HOST_ID, "user_host", "host@example.test")
+    assert renew(test_client, None).status_code == 200
+
+    db.query(Meeting).one().is_active = False
+    db.commit()
+    assert renew(test_client, None).status_code == 410
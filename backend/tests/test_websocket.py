@@ -0,0 +1,66 @@
+"""
+Signaling socket lifecycle through the real /ws route: malformed frames are
+skipped and every way out of the receive loop removes the peer.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend.app.core.codec import dumps, loads
+from backend.app.core.config import settings
+from backend.app.core.tickets import issue_join_ticket
+from backend.app.core.websocket_manager import manager
+from backend.app.main import app
+
+ROOM = "ws-tst-001"
+
+
+def url(user_id: int) -> str:
+    return f"/ws/{ROOM}?ticket={issue_join_ticket(ROOM, user_id)}"
+
+
+def recv_type(ws, wanted: str) -> dict:
+    while True:
+        frame = loads(ws.receive_text())
+        if frame.get("type") == wanted:
+            return frame
+
+
+@pytest.fixture(params=["raw", "json"])
+def client(request, monkeypatch):
+    monkeypatch.setattr(settings, "WS_RELAY_MODE", request.param)
+    # Lifespan shutdown leaves the shared manager draining
+    monkeypatch.setattr(manager, "draining", False)
+    # One portal (event loop) for every socket, like a single worker
+    with TestClient(app) as test_client:
+        yield test_client
+    assert not manager.connections
+
+
+def test_bad_frames_are_skipped_and_leaving_cleans_up(client):
+    with client.websocket_connect(url(1)) as a:
+        a.send_text(dumps({"type": "join", "senderId": "A"}))
+        with client.websocket_connect(url(2)) as b:
+            b.send_text(dumps({"type": "join", "senderId": "B"}))
+            recv_type(a, "join")
+
+            b.send_bytes(b"\x00\x01")
+            b.send_text("{not json")
+            b.send_text(dumps({"type": "chat", "text": "still here"}))
+            assert recv_type(a, "chat")["text"] == "still here"
+            assert sorted(manager.peers[ROOM]) == ["A", "B"]
+
+        assert recv_type(a, "user-left")["senderId"] == "B"
+        assert list(manager.peers[ROOM]) == ["A"]
+
+
+def test_peer_id_of_another_user_cannot_be_taken_over(client):
+    with client.websocket_connect(url(1)) as a:
+        a.send_text(dumps({"type": "join", "senderId": "A"}))
+        with client.websocket_connect(url(2)) as b:
+            b.send_text(dumps({"type": "join", "senderId": "A"}))
+            with pytest.raises(WebSocketDisconnect) as refused:
+                recv_type(b, "never")
+            assert refused.value.code == 1008
+        assert manager.peers[ROOM]["A"].user_id == 1
+        assert manager.metrics["peer_id_conflicts"] >= 1
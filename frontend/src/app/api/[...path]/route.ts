@@ -4,11 +4,31 @@ import { NextRequest, NextResponse } from "next/server";
 // to IPv6 [::1] first, and uvicorn only listens on IPv4 by default.
 const BACKEND_URL = process.env.BACKEND_URL || "http://127.0.0.1:8000";
 
+// Backend response headers that carry API semantics and must reach the browser
+// (pagination cursor for /meetings/my-meetings, 429 backoff for /meetings/join)
+const FORWARDED_RESPONSE_HEADERS = ["x-next-cursor", "retry-after"];
+
+function forwardedHeaders(resp: Response): Record<string, string> {
+    const headers: Record<string, string> = {};
+    for (const name of FORWARDED_RESPONSE_HEADERS) {
+        const value = resp.headers.get(name);
+        if (value !== null) {
+            headers[name] = value;
+        }
+    }
+    return headers;
+}
+
 async function proxyRequest(
     request: NextRequest,
     method: string,
     pathSegments: string[]
 ) {
+    // Operational endpoints (/internal/*) are never reachable from the public site
+    if (pathSegments[0] === "internal") {
+        return NextResponse.json({ detail: "Not Found" }, { status: 404 });
+    }
+
     const backendPath = "/" + pathSegments.join("/");
     const url = `${BACKEND_URL}${backendPath}`;
 
@@ -47,13 +67,13 @@ async function proxyRequest(
         // Try to parse as JSON, if it fails just return the text
         try {
             const data = JSON.parse(responseText);
-            return NextResponse.json(data, { status: resp.status });
+            return NextResponse.json(data, { status: resp.status, headers: forwardedHeaders(resp) });
         } catch {
             // Not JSON — return the raw text with the backend's status
             console.error(`[proxy] Non-JSON response from ${url}: ${responseText.substring(0, 200)}`);
             return NextResponse.json(
                 { detail: responseText.substring(0, 500) || `Backend error (HTTP ${resp.status})` },
-                { status: resp.status }
+                { status: resp.status, headers: forwardedHeaders(resp) }
             );
         }
     } catch (err: any) {
@@ -3,7 +3,7 @@ import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
 import { useAuth } from "@clerk/nextjs";
 import { Lock, CheckCircle, AlertCircle } from "lucide-react";
-import { apiFetch } from "@/lib/api";
+import { apiFetch, saveJoinTicket } from "@/lib/api";
 
 interface InvitationDetails {
   meeting_id: string;
@@ -56,7 +56,7 @@ export default function JoinByInvitation() {
       setJoiningMeeting(true);
       const token = await getToken();
 
-      await apiFetch(
+      const res = await apiFetch(
         "/meetings/join",
         {
           method: "POST",
@@ -68,6 +68,8 @@ export default function JoinByInvitation() {
         token
       );
 
+      saveJoinTicket(meetingDetails.meeting_id, res.data?.ticket);
+
       // Redirect to the meeting room
       router.push(`/room/${meetingDetails.meeting_id}`);
     } catch (err: any) {
@@ -4,7 +4,7 @@ import { useUser, useAuth } from "@clerk/nextjs";
 import { useState, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { Camera, VideoOff, ArrowRight, Plus, Monitor, Copy, Check, X } from 'lucide-react';
-import { apiFetch } from '@/lib/api';
+import { apiFetch, saveJoinTicket } from '@/lib/api';
 
 interface MeetingCreated {
   meeting_id: string;
@@ -58,10 +58,11 @@ export default function Lobby() {
         localStorage.setItem("token", token);
       }
 
-      await apiFetch("/meetings/join", {
+      const res = await apiFetch("/meetings/join", {
         method: "POST",
         body: JSON.stringify({ meeting_id: meetingId, password: "" })
       }, token);
+      saveJoinTicket(meetingId, res.data?.ticket);
       
       router.push(`/room/${meetingId}`);
     } catch (err: any) {
@@ -107,7 +108,17 @@ export default function Lobby() {
 
   const handleEnterMeeting = async () => {
     if (!meetingData) return;
-    router.push(`/room/${meetingData.meeting_id}`);
+    try {
+      // Fetch a fresh join ticket for the signaling socket
+      const res = await apiFetch("/meetings/join", {
+        method: "POST",
+        body: JSON.stringify({ meeting_id: meetingData.meeting_id, password: meetingData.password })
+      }, await getToken());
+      saveJoinTicket(meetingData.meeting_id, res.data?.ticket);
+      router.push(`/room/${meetingData.meeting_id}`);
+    } catch (err: any) {
+      alert("Failed to enter meeting: " + err.message);
+    }
   };
 
   return (
@@ -1,7 +1,13 @@
 "use client";
 import { useEffect, useRef, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
+import { useAuth } from "@clerk/nextjs";
 import { Mic, MicOff, Video, VideoOff, PhoneOff, Users, Share2, Copy, Check, X } from "lucide-react";
+import { getJoinTicket, renewJoinTicket, saveJoinTicket } from "@/lib/api";
+
+// Policy violation: the server refused the join ticket
+const WS_CLOSE_REFUSED = 1008;
+const MAX_RECONNECT_ATTEMPTS = 5;
 
 const STUN_SERVERS = {
   iceServers: [
@@ -29,6 +35,7 @@ const RemoteVideo = ({ stream }: { stream: MediaStream }) => {
 export default function MeetingRoom() {
   const params = useParams();
   const router = useRouter();
+  const { getToken } = useAuth();
   const roomId = params.id as string;
 
   const localVideoRef = useRef<HTMLVideoElement>(null);
@@ -52,6 +59,7 @@ export default function MeetingRoom() {
 
   useEffect(() => {
     let mounted = true;
+    let reconnecting = false;
 
     const initMeeting = async () => {
       let stream: MediaStream | null = null;
@@ -85,11 +93,20 @@ export default function MeetingRoom() {
         const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
         const wsUrl = process.env.NEXT_PUBLIC_WS_URL ||
           `${protocol}//${window.location.hostname}:8000/ws/${roomId}`;
+        // The server refuses the handshake without a valid ticket from /meetings/join
+        const ticket = getJoinTicket(roomId) || "";
 
-        wsRef.current = new WebSocket(wsUrl);
+        wsRef.current = new WebSocket(`${wsUrl}?ticket=${encodeURIComponent(ticket)}`);
 
         wsRef.current.onopen = () => {
-          wsRef.current?.send(JSON.stringify({ type: "join", senderId: localUserId }));
+          sessionStorage.removeItem(`ticketRenewed:${roomId}`);
+          sessionStorage.removeItem(`reconnectAttempts:${roomId}`);
+          wsRef.current?.send(JSON.stringify({
+            type: "join",
+            senderId: localUserId,
+            // Lets the server coalesce trickled candidates into "ice-candidates" frames
+            capabilities: ["ice-batch"]
+          }));
         };
 
         wsRef.current.onmessage = async (event) => {
@@ -99,6 +116,19 @@ export default function MeetingRoom() {
           if (data.targetId && data.targetId !== localUserId) return;
 
           switch (data.type) {
+            case "ping":
+              // Server heartbeat; silent sockets are reaped
+              wsRef.current?.send(JSON.stringify({ type: "pong" }));
+              break;
+
+            case "reconnect":
+              // Server is draining for a deploy: rejoin after the jittered delay
+              // with the fresh ticket it handed out
+              reconnecting = true;
+              saveJoinTicket(roomId, data.ticket);
+              setTimeout(() => window.location.reload(), data.retryAfterMs || 0);
+              break;
+
             case "join":
               const pc = createPeerConnection(data.senderId, stream);
               const offer = await pc.createOffer();
@@ -164,25 +194,60 @@ export default function MeetingRoom() {
               break;
 
             case "ice-candidate":
-              if (peersRef.current[data.senderId] && data.candidate) {
-                const pcIce = peersRef.current[data.senderId];
-                if (pcIce.remoteDescription) {
-                  try {
-                    await pcIce.addIceCandidate(new RTCIceCandidate(data.candidate));
-                  } catch (e) {
-                    console.error("Error adding ice candidate", e);
-                  }
-                } else {
-                  if (!pendingCandidates.current[data.senderId]) {
-                    pendingCandidates.current[data.senderId] = [];
-                  }
-                  pendingCandidates.current[data.senderId].push(data.candidate);
-                }
+              if (data.candidate) {
+                await handleRemoteCandidate(data.senderId, data.candidate);
+              }
+              break;
+
+            case "ice-candidates":
+              for (const candidate of data.candidates || []) {
+                await handleRemoteCandidate(data.senderId, candidate);
               }
               break;
           }
         };
 
+        wsRef.current.onclose = async (event) => {
+          if (!mounted || reconnecting) return;
+          if (event.code !== WS_CLOSE_REFUSED) {
+            // 1012 from a draining worker, or a dropped connection: the ticket
+            // is still good, so retry with it after a jittered backoff
+            const attemptsKey = `reconnectAttempts:${roomId}`;
+            const attempts = Number(sessionStorage.getItem(attemptsKey) || 0);
+            if (attempts < MAX_RECONNECT_ATTEMPTS) {
+              sessionStorage.setItem(attemptsKey, String(attempts + 1));
+              const delay = Math.random() * Math.min(30000, 1000 * 2 ** attempts);
+              setTimeout(() => window.location.reload(), delay);
+              return;
+            }
+            sessionStorage.removeItem(attemptsKey);
+            if (mounted) {
+              alert("Lost the connection to this meeting. Please join again.");
+              router.push("/");
+            }
+            return;
+          }
+          // The ticket was refused, usually because it expired (e.g. the page
+          // was reloaded long after joining). Renew it once and reload; if that
+          // fails, or a renewed ticket is refused too, go back to the join flow.
+          const renewedKey = `ticketRenewed:${roomId}`;
+          if (!sessionStorage.getItem(renewedKey)) {
+            try {
+              await renewJoinTicket(roomId, await getToken());
+              sessionStorage.setItem(renewedKey, "1");
+              window.location.reload();
+              return;
+            } catch (err) {
+              console.error("Could not renew join ticket:", err);
+            }
+          }
+          sessionStorage.removeItem(renewedKey);
+          if (mounted) {
+            alert("Lost the connection to this meeting. Please join again.");
+            router.push("/");
+          }
+        };
+
       } catch (err) {
         if (mounted) console.error("Error accessing media devices or connecting WebRTC:", err);
       }
@@ -198,6 +263,23 @@ export default function MeetingRoom() {
     };
   }, [roomId, localUserId]);
 
+  const handleRemoteCandidate = async (partnerId: string, candidate: RTCIceCandidateInit) => {
+    const pcIce = peersRef.current[partnerId];
+    if (!pcIce) return;
+    if (pcIce.remoteDescription) {
+      try {
+        await pcIce.addIceCandidate(new RTCIceCandidate(candidate));
+      } catch (e) {
+        console.error("Error adding ice candidate", e);
+      }
+    } else {
+      if (!pendingCandidates.current[partnerId]) {
+        pendingCandidates.current[partnerId] = [];
+      }
+      pendingCandidates.current[partnerId].push(candidate);
+    }
+  };
+
   const createPeerConnection = (partnerId: string, stream: MediaStream | null) => {
     if (peersRef.current[partnerId]) {
       peersRef.current[partnerId].close();
@@ -43,4 +43,30 @@ export const apiFetch = async (endpoint: string, options: RequestInit = {}, toke
     }
     throw err;
   }
-};
\ No newline at end of file
+};
+
+/**
+ * Join tickets — /meetings/join returns a short-lived signed ticket that the
+ * signaling WebSocket requires. Kept per tab, keyed by room.
+ */
+export const saveJoinTicket = (roomId: string, ticket?: string) => {
+  if (ticket && typeof window !== "undefined") {
+    sessionStorage.setItem(`joinTicket:${roomId}`, ticket);
+  }
+};
+
+export const getJoinTicket = (roomId: string): string | null =>
+  typeof window !== "undefined" ? sessionStorage.getItem(`joinTicket:${roomId}`) : null;
+
+/**
+ * Swap the stored (possibly expired) ticket for a fresh one. Throws when the
+ * server will not renew it, e.g. the meeting ended or the ticket is too old.
+ */
+export const renewJoinTicket = async (roomId: string, token?: string | null): Promise<string> => {
+  const res = await apiFetch("/meetings/ticket", {
+    method: "POST",
+    body: JSON.stringify({ meeting_id: roomId, ticket: getJoinTicket(roomId) })
+  }, token);
+  saveJoinTicket(roomId, res.ticket);
+  return res.ticket;
+};